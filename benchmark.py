@@ -0,0 +1,378 @@
+"""Benchmark das páginas com dados sintéticos de ANDAMENTOS.
+
+Gera a tabela ANDAMENTOS num SQLite local (uma base por escala, reusada
+entre execuções) e mede cada etapa das páginas: consulta, leitura das
+linhas, montagem do DataFrame, agregação e construção dos gráficos. Cada
+medição vira uma linha JSON, para comparar execuções entre mudanças::
+
+    python benchmark.py --rows 10000 1000000 --output resultados.jsonl
+"""
+
+import argparse
+import datetime
+import json
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+import cubo
+import db
+import frames
+import graficos
+import paginas
+from procuradorias import PROCURADORIAS, Procuradoria
+
+# Período coberto pelos dados sintéticos
+INICIO = datetime.date(2019, 1, 1)
+FIM = datetime.date(2025, 12, 31)
+
+# Linhas geradas e gravadas por vez
+LOTE = 250_000
+
+
+def gerar_lote(
+    rng: np.random.Generator,
+    primeiro_id: int,
+    quantidade: int,
+) -> list[tuple]:
+    """Generate ``quantidade`` synthetic ANDAMENTOS rows.
+
+    Procuradorias and names follow a Zipf-like skew, the volume grows over
+    time, weekend publications are mostly moved to the nearest weekday and
+    about 0.1% of the rows have no ``datapub``.
+    """
+    filtros = [p.filtro for p in PROCURADORIAS]
+    peso = 1 / np.arange(1, len(filtros) + 1) ** 1.1
+    procuradoria = rng.choice(len(filtros), size=quantidade, p=peso / peso.sum())
+
+    # Mais publicações nos anos recentes: densidade linear no tempo
+    dias = (FIM - INICIO).days
+    deslocamento = (np.sqrt(rng.random(quantidade)) * dias).astype("int64")
+    datapub = (
+        np.datetime64(INICIO)
+        + deslocamento.astype("timedelta64[D]")
+        + rng.integers(8 * 3600, 20 * 3600, quantidade).astype("timedelta64[s]")
+    )
+    dia_semana = (deslocamento + INICIO.weekday()) % 7
+    fim_de_semana = (dia_semana >= 5) & (rng.random(quantidade) < 0.8)
+    datapub[fim_de_semana] -= (dia_semana[fim_de_semana] - 4).astype(
+        "timedelta64[D]",
+    )
+    texto_datapub = np.char.replace(
+        np.datetime_as_string(datapub, unit="s"), "T", " ",
+    ).astype(object)
+    texto_datapub[rng.random(quantidade) < 0.001] = None
+
+    # Poucos nomes concentram a maior parte das publicações
+    equipes = [_equipe(p) for p in PROCURADORIAS]
+    tamanho = np.array([len(e) for e in equipes])[procuradoria]
+    nome = np.minimum(rng.zipf(1.6, quantidade), tamanho) - 1
+
+    ids = range(primeiro_id, primeiro_id + quantidade)
+    return [
+        (i, filtros[p], equipes[p][n], d, f"Publicação {i} no diário oficial")
+        for i, p, n, d in zip(
+            ids, procuradoria.tolist(), nome.tolist(), texto_datapub,
+        )
+    ]
+
+
+def _equipe(procuradoria: Procuradoria) -> tuple[str, ...]:
+    """Return the registered roster, or 20 made-up names."""
+    return procuradoria.nomes or tuple(
+        f"Procurador {n:02d} {procuradoria.rotulo}" for n in range(1, 21)
+    )
+
+
+def criar_base(caminho: Path, linhas: int, semente: int = 42) -> None:
+    """Create the SQLite stand-in with ``linhas`` synthetic rows."""
+    temporario = caminho.with_suffix(".tmp")
+    temporario.unlink(missing_ok=True)
+    conn = sqlite3.connect(temporario)
+    conn.execute(
+        "CREATE TABLE ANDAMENTOS ("
+        " id INTEGER PRIMARY KEY,"
+        " nome_procuradoria TEXT,"
+        " name TEXT,"
+        " datapub TEXT,"
+        " texto TEXT)",
+    )
+    rng = np.random.default_rng(semente)
+    for inicio in range(0, linhas, LOTE):
+        conn.executemany(
+            "INSERT INTO ANDAMENTOS VALUES (?, ?, ?, ?, ?)",
+            gerar_lote(rng, inicio + 1, min(LOTE, linhas - inicio)),
+        )
+    conn.execute(
+        "CREATE INDEX idx_procuradoria_datapub"
+        " ON ANDAMENTOS (nome_procuradoria, datapub)",
+    )
+    conn.commit()
+    conn.close()
+    temporario.replace(caminho)
+
+
+def _sql_sqlite(query: str) -> str:
+    """Translate the MySQL used by the dashboard to SQLite."""
+    return query.replace("%s", "?").replace("%%", "%")
+
+
+class Medidor:
+    """Collect the time of each stage, repeated ``repeticoes`` times."""
+
+    def __init__(self, repeticoes: int) -> None:
+        """Start with no measurements."""
+        self.repeticoes = repeticoes
+        self.resultados: list[dict] = []
+
+    def medir(
+        self,
+        pagina: str,
+        etapa: str,
+        funcao: Callable[[], Any],
+    ) -> Any:
+        """Run ``funcao`` and record its times; return its last result."""
+        tempos = []
+        for _ in range(self.repeticoes):
+            inicio = time.perf_counter()
+            resultado = funcao()
+            tempos.append(time.perf_counter() - inicio)
+        self.resultados.append({
+            "pagina": pagina,
+            "etapa": etapa,
+            "segundos": statistics.median(tempos),
+            "minimo": min(tempos),
+            "linhas": _tamanho(resultado),
+        })
+        return resultado
+
+
+def _tamanho(resultado: Any) -> int | None:
+    """Return how many rows (or JSON characters) a stage produced."""
+    if isinstance(resultado, list) and resultado and isinstance(resultado[0], list):
+        return sum(len(bloco) for bloco in resultado)
+    if isinstance(resultado, cubo.Resumo):
+        return len(resultado.por_periodo)
+    if isinstance(resultado, cubo.Indice):
+        return len(resultado.dados)
+    try:
+        return len(resultado)
+    except TypeError:
+        return None
+
+
+def consultar(
+    medidor: Medidor,
+    conn: sqlite3.Connection,
+    pagina: str,
+    query: str,
+) -> pd.DataFrame:
+    """Time the query, the fetch and the DataFrame build of ``query``."""
+    sql = _sql_sqlite(query)
+    cursor = conn.cursor()
+
+    def buscar() -> list[list[tuple]]:
+        cursor.execute(sql)
+        blocos = []
+        while bloco := cursor.fetchmany(db.FETCH_CHUNK_SIZE):
+            blocos.append(bloco)
+        return blocos
+
+    def executar() -> None:
+        # O SQLite só executa de fato ao ler a primeira linha
+        cursor.execute(sql).fetchone()
+
+    medidor.medir(pagina, "consulta", executar)
+    blocos = medidor.medir(pagina, "leitura", buscar)
+    colunas = [desc[0] for desc in cursor.description]
+    return medidor.medir(
+        pagina,
+        "dataframe",
+        lambda: frames.concat(
+            frames.typed(pd.DataFrame(bloco, columns=colunas))
+            for bloco in (blocos or [[]])
+        ),
+    )
+
+
+def medir_paginas(
+    medidor: Medidor,
+    conn: sqlite3.Connection,
+    *,
+    legado: bool = False,
+) -> None:
+    """Time every stage of every dashboard page against ``conn``."""
+    # O cubo diário é lido uma vez e atende todas as páginas
+    diario = consultar(medidor, conn, "cubo", db.DAILY_COUNTS_QUERY)
+    indice = medidor.medir("cubo", "indice", lambda: cubo.index(diario))
+    todas = medidor.medir(
+        "visao-geral", "resumo", lambda: cubo.counts_all(diario),
+    )
+    periodos = medidor.medir(
+        "visao-geral",
+        "agregacao",
+        lambda: paginas.visao_geral_periodos(todas, "mes"),
+    )
+    medidor.medir(
+        "visao-geral",
+        "grafico",
+        lambda: graficos.figura_visao_geral(periodos, "mes").to_json(),
+    )
+
+    (ultimo,) = conn.execute("SELECT MAX(datapub) FROM ANDAMENTOS").fetchone()
+    fim = datetime.date.fromisoformat(ultimo[:10])
+
+    for procuradoria in PROCURADORIAS:
+        pagina = procuradoria.slug
+        if procuradoria.nomes:
+            dados = medidor.medir(
+                pagina,
+                "resumo",
+                lambda p=procuradoria: cubo.counts_by_name(
+                    indice,
+                    p.filtro,
+                    p.nomes,
+                    p.data_inicial or INICIO,
+                    fim,
+                ),
+            )
+            resumo = medidor.medir(
+                pagina,
+                "agregacao",
+                lambda d=dados: cubo.summarize(d, "mes"),
+            )
+            medidor.medir(
+                pagina,
+                "grafico",
+                lambda r=resumo: "".join([
+                    graficos.figura_pizza_por_nome(r, "mes").to_json(),
+                    graficos.figura_barras_mensais_echarts(r, "mes").dump_options(),
+                    graficos.figura_barras_mensais_por_nome(r, "mes").to_json(),
+                ]),
+            )
+        else:
+            resumo = medidor.medir(
+                pagina,
+                "agregacao",
+                lambda p=procuradoria: cubo.summarize(
+                    todas[todas["nome_procuradoria"] == p.filtro]
+                    .drop(columns="nome_procuradoria"),
+                    "mes",
+                ),
+            )
+            medidor.medir(
+                pagina,
+                "grafico",
+                lambda r=resumo: graficos.figura_barras_mensais(r, "mes").to_json(),
+            )
+
+        if legado:
+            medir_legado(medidor, conn, procuradoria.filtro, f"legado-{pagina}")
+
+
+def medir_legado(
+    medidor: Medidor,
+    conn: sqlite3.Connection,
+    filtro: str,
+    pagina: str,
+) -> None:
+    """Time the original page pipeline (``SELECT *`` and pandas grouping)."""
+    cursor = conn.cursor()
+    query = "SELECT * FROM ANDAMENTOS WHERE nome_procuradoria=?"
+
+    def executar() -> None:
+        cursor.execute(query, [filtro]).fetchone()
+
+    medidor.medir(pagina, "consulta", executar)
+    resultados = medidor.medir(
+        pagina, "leitura", lambda: cursor.execute(query, [filtro]).fetchall(),
+    )
+    colunas = [desc[0] for desc in cursor.description]
+    dados = medidor.medir(
+        pagina, "dataframe", lambda: pd.DataFrame(resultados, columns=colunas),
+    )
+
+    def agregar() -> pd.DataFrame:
+        datapub = pd.to_datetime(dados["datapub"])
+        mes_ano = datapub.dt.to_period("M").astype(str)
+        return dados.groupby(mes_ano).size().reset_index(name="quantidade")
+
+    medidor.medir(pagina, "agregacao", agregar)
+
+
+def _commit() -> str | None:
+    """Return the current git commit, when running inside the repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            check=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+        help="escalas (linhas de ANDAMENTOS) a medir",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data-dir", type=Path, default=Path(".benchmark"))
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="arquivo JSON Lines onde acrescentar os resultados",
+    )
+    parser.add_argument(
+        "--legado",
+        action="store_true",
+        help="medir também o pipeline original (SELECT * por procuradoria)",
+    )
+    args = parser.parse_args()
+
+    execucao = {
+        "data": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+    }
+    args.data_dir.mkdir(parents=True, exist_ok=True)
+    saida = args.output.open("a") if args.output else sys.stdout
+    try:
+        for linhas in args.rows:
+            base = args.data_dir / f"andamentos-{linhas}.sqlite"
+            if not base.exists():
+                print(f"Gerando {linhas} linhas em {base}...", file=sys.stderr)
+                criar_base(base, linhas)
+
+            medidor = Medidor(args.repeat)
+            conn = sqlite3.connect(base)
+            try:
+                medir_paginas(medidor, conn, legado=args.legado)
+            finally:
+                conn.close()
+
+            for resultado in medidor.resultados:
+                registro = {**execucao, "escala": linhas, **resultado}
+                print(json.dumps(registro, ensure_ascii=False), file=saida)
+    finally:
+        if saida is not sys.stdout:
+            saida.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Cubo de contagens diárias (dia × nome × procuradoria) e seus resumos."""
+
+import datetime
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+import frames
+
+# Colunas do cubo, na ordem em que ele é agrupado e ordenado
+COLUNAS = ["nome_procuradoria", "dia", "name", "quantidade"]
+
+
+def from_rows(dados: pd.DataFrame) -> pd.DataFrame:
+    """Count raw ANDAMENTOS rows (with ``datapub``) per day and name."""
+    dia = pd.to_datetime(dados["datapub"]).dt.normalize().rename("dia")
+    return (
+        dados.groupby(
+            ["nome_procuradoria", dia, "name"],
+            dropna=False,
+            observed=True,
+        )
+        .size()
+        .reset_index(name="quantidade")
+    )
+
+
+def counts_all(cubo: pd.DataFrame, granularidade: str = "mes") -> pd.DataFrame:
+    """Roll the cube up to the counts of every procuradoria per period.
+
+    Returns the columns ``nome_procuradoria``, ``periodo`` (see
+    :func:`frames.period_key`) and ``quantidade``; days without a date are
+    summed under a null ``periodo``.
+    """
+    periodo = frames.period_key(cubo["dia"], granularidade).rename("periodo")
+    return (
+        cubo.groupby(
+            ["nome_procuradoria", periodo],
+            dropna=False,
+            observed=True,
+        )["quantidade"]
+        .sum()
+        .reset_index()
+    )
+
+
+@dataclass(frozen=True)
+class Indice:
+    """Cube sorted by procuradoria and day, with the row positions of each name.
+
+    Built once per loaded cube by :func:`index`, so that
+    :func:`counts_by_name` finds a date range with two binary searches and
+    a name through its position array instead of scanning every row.
+    """
+
+    dados: pd.DataFrame
+    # Dias de cada linha em nanossegundos; sem data fica o menor inteiro
+    dias: np.ndarray
+    # Primeira e última (exclusiva) linha de cada procuradoria
+    limites: dict[str, tuple[int, int]]
+    # Linhas de cada (procuradoria, nome), em ordem crescente
+    posicoes: dict[tuple[str, str], np.ndarray]
+
+
+def index(cubo: pd.DataFrame) -> Indice:
+    """Sort the cube and index its rows by procuradoria, day and name."""
+    dados = cubo.sort_values(
+        ["nome_procuradoria", "dia"], na_position="first", kind="stable",
+    ).reset_index(drop=True)
+    return Indice(
+        dados=dados,
+        dias=dados["dia"].to_numpy("datetime64[ns]").view("int64"),
+        limites={
+            str(procuradoria): (int(posicoes[0]), int(posicoes[-1]) + 1)
+            for procuradoria, posicoes in dados.groupby(
+                "nome_procuradoria", observed=True,
+            ).indices.items()
+        },
+        posicoes={
+            (str(procuradoria), str(nome)): posicoes
+            for (procuradoria, nome), posicoes in dados.groupby(
+                ["nome_procuradoria", "name"], observed=True,
+            ).indices.items()
+        },
+    )
+
+
+def replace(
+    indice: Indice,
+    procuradorias: tuple[str, ...],
+    cubo: pd.DataFrame,
+) -> Indice:
+    """Return the index with the rows of ``procuradorias`` taken from ``cubo``.
+
+    ``cubo`` holds the reloaded rows of just those procuradorias; a
+    procuradoria missing from it has no rows left.
+    """
+    mantidos = indice.dados[
+        ~indice.dados["nome_procuradoria"].isin(procuradorias)
+    ]
+    return index(frames.concat([mantidos, cubo[COLUNAS]]))
+
+
+def counts_by_name(
+    indice: Indice,
+    procuradoria: str,
+    names: tuple[str, ...],
+    start: datetime.date,
+    end: datetime.date,
+    granularidade: str = "mes",
+) -> pd.DataFrame:
+    """Roll the cube up to counts per period and name within ``[start, end]``.
+
+    The rows are selected through the :class:`Indice`: the date range is
+    two binary searches within the procuradoria and each name a slice of
+    its positions, so only the selected rows are ever copied. Returns the
+    columns ``periodo``, ``name`` and ``quantidade``.
+    """
+    primeira, ultima = indice.limites.get(procuradoria, (0, 0))
+    dias = indice.dias[primeira:ultima]
+    inicio = primeira + int(np.searchsorted(dias, pd.Timestamp(start).value))
+    fim = primeira + int(
+        np.searchsorted(dias, pd.Timestamp(end).value, side="right"),
+    )
+    if names:
+        # Em cada nome, as linhas do intervalo também são uma fatia contínua
+        partes = [
+            posicoes[np.searchsorted(posicoes, inicio):np.searchsorted(posicoes, fim)]
+            for posicoes in (
+                indice.posicoes.get((procuradoria, nome)) for nome in names
+            )
+            if posicoes is not None
+        ]
+        linhas = np.sort(np.concatenate([np.empty(0, dtype="int64"), *partes]))
+        fatia = indice.dados.take(linhas)
+    else:
+        fatia = indice.dados.iloc[inicio:fim]
+    periodo = frames.period_key(fatia["dia"], granularidade).rename("periodo")
+    return (
+        fatia.groupby([periodo, "name"], observed=True)["quantidade"]
+        .sum()
+        .reset_index()
+    )
+
+
+@dataclass(frozen=True)
+class Resumo:
+    """Counts of one page, rolled up once and shared by all its widgets.
+
+    Periods appear as their labels, in chronological order.
+    """
+
+    total: int
+    chaves: pd.Series
+    por_periodo: pd.DataFrame
+    por_nome: pd.DataFrame
+    por_periodo_nome: pd.DataFrame
+
+
+def summarize(dados: pd.DataFrame, granularidade: str) -> Resumo:
+    """Derive every total a page shows from its counts per period (and name).
+
+    ``dados`` has the columns ``periodo`` (see :func:`frames.period_key`),
+    ``quantidade`` and, on team pages, ``name``. The period × name matrix is
+    built in a single grouping; the totals per period and per name are its
+    row and column sums. ``total`` also counts the undated publications,
+    which are left out of everything else.
+    """
+    total = int(dados["quantidade"].sum())
+    datados = dados.dropna(subset=["periodo"])
+    if "name" in datados:
+        matriz = (
+            datados.groupby(["periodo", "name"], observed=True)["quantidade"]
+            .sum()
+            .unstack(fill_value=0)
+        )
+        por_nome = matriz.sum().sort_values(ascending=False)
+    else:
+        matriz = datados.groupby("periodo")["quantidade"].sum().to_frame()
+        por_nome = pd.Series([], dtype="int64")
+        # Sem a divisão por nome, cada período fica com o nome nulo
+        datados = datados.assign(name=None)
+
+    chaves = pd.Series(matriz.index, name="periodo")
+    rotulos = frames.period_label(chaves, granularidade).to_numpy()
+    return Resumo(
+        total=total,
+        chaves=chaves,
+        por_periodo=pd.DataFrame({
+            "periodo": rotulos,
+            "quantidade": matriz.sum(axis=1).to_numpy(),
+        }),
+        por_nome=pd.DataFrame({
+            "name": por_nome.index.astype(str),
+            "quantidade": por_nome.to_numpy(),
+        }),
+        por_periodo_nome=pd.DataFrame({
+            "periodo": rotulos[matriz.index.get_indexer(datados["periodo"])],
+            "name": datados["name"].to_numpy(),
+            "quantidade": datados["quantidade"].to_numpy(),
+        }),
+    )
@@ -0,0 +1,160 @@
+"""Testes do índice do cubo diário."""
+
+import datetime
+import unittest
+
+import pandas as pd
+
+import cubo
+import frames
+
+
+def _cubo() -> pd.DataFrame:
+    """Return a small cube, out of order and with undated rows."""
+    linhas = [
+        ("PFT", "2024-01-31", "Ana", 1),
+        ("PFT", "2024-01-01", "Bia", 2),
+        ("PCIDADE", "2024-02-10", "Ana", 4),
+        ("PFT", None, "Ana", 8),
+        ("PFT", "2024-02-01", "Ana", 16),
+        ("PFT", "2024-01-15", "Ana", 32),
+        ("PCIDADE", None, "Bia", 64),
+        ("PFT", "2024-02-29", "Bia", 128),
+        ("PFT", "2024-01-15", "Caio", 256),
+    ]
+    return frames.typed(pd.DataFrame(linhas, columns=cubo.COLUNAS))
+
+
+def _referencia(
+    dados: pd.DataFrame,
+    procuradoria: str,
+    names: tuple[str, ...],
+    start: datetime.date,
+    end: datetime.date,
+) -> dict[tuple[int, str], int]:
+    """Count by scanning every row, as before the index existed."""
+    dia = dados["dia"]
+    filtro = (
+        (dados["nome_procuradoria"] == procuradoria)
+        & (dia >= pd.Timestamp(start))
+        & (dia <= pd.Timestamp(end))
+    )
+    if names:
+        filtro &= dados["name"].isin(names)
+    fatia = dados[filtro]
+    periodo = frames.period_key(fatia["dia"], "mes")
+    return {
+        (int(chave), str(nome)): int(quantidade)
+        for (chave, nome), quantidade in fatia.groupby(
+            [periodo, "name"], observed=True,
+        )["quantidade"].sum().items()
+    }
+
+
+def _contagens(resultado: pd.DataFrame) -> dict[tuple[int, str], int]:
+    return {
+        (int(chave), str(nome)): int(quantidade)
+        for chave, nome, quantidade in resultado.itertuples(index=False)
+    }
+
+
+class CountsByNameTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dados = _cubo()
+        self.indice = cubo.index(self.dados)
+
+    def assertMatches(
+        self,
+        procuradoria: str,
+        names: tuple[str, ...],
+        start: datetime.date,
+        end: datetime.date,
+    ) -> None:
+        self.assertEqual(
+            _contagens(cubo.counts_by_name(
+                self.indice, procuradoria, names, start, end,
+            )),
+            _referencia(self.dados, procuradoria, names, start, end),
+        )
+
+    def test_end_date_is_inclusive(self) -> None:
+        resultado = cubo.counts_by_name(
+            self.indice, "PFT", (), datetime.date(2024, 1, 1),
+            datetime.date(2024, 1, 31),
+        )
+        self.assertEqual(int(resultado["quantidade"].sum()), 1 + 2 + 32 + 256)
+
+    def test_undated_rows_are_left_out(self) -> None:
+        resultado = cubo.counts_by_name(
+            self.indice, "PCIDADE", (), datetime.date(1970, 1, 1),
+            datetime.date(2100, 1, 1),
+        )
+        self.assertEqual(int(resultado["quantidade"].sum()), 4)
+
+    def test_names_are_sliced_to_the_date_range(self) -> None:
+        self.assertMatches(
+            "PFT", ("Ana", "Caio"), datetime.date(2024, 1, 15),
+            datetime.date(2024, 2, 1),
+        )
+
+    def test_matches_a_full_scan(self) -> None:
+        # Limites em cima das linhas do cubo e entre elas
+        datas = [
+            datetime.date(2023, 12, 31),
+            datetime.date(2024, 1, 1),
+            datetime.date(2024, 1, 15),
+            datetime.date(2024, 1, 31),
+            datetime.date(2024, 2, 10),
+            datetime.date(2024, 2, 29),
+        ]
+        for procuradoria in ("PFT", "PCIDADE"):
+            for names in ((), ("Ana",), ("Bia", "Caio")):
+                for start in datas:
+                    for end in datas:
+                        with self.subTest(
+                            procuradoria=procuradoria, names=names,
+                            start=start, end=end,
+                        ):
+                            self.assertMatches(procuradoria, names, start, end)
+
+    def test_unknown_procuradoria_or_name_is_empty(self) -> None:
+        inicio, fim = datetime.date(2024, 1, 1), datetime.date(2024, 12, 31)
+        self.assertTrue(
+            cubo.counts_by_name(self.indice, "PGE", (), inicio, fim).empty,
+        )
+        self.assertTrue(
+            cubo.counts_by_name(self.indice, "PFT", ("Davi",), inicio, fim).empty,
+        )
+
+    def test_replace_swaps_only_the_given_procuradorias(self) -> None:
+        novos = frames.typed(pd.DataFrame(
+            [("PCIDADE", "2024-03-01", "Davi", 512)], columns=cubo.COLUNAS,
+        ))
+        self.dados = frames.concat([
+            self.dados[self.dados["nome_procuradoria"] != "PCIDADE"], novos,
+        ])
+        self.indice = cubo.replace(self.indice, ("PCIDADE", "PPUI"), novos)
+        self.assertEqual(set(self.indice.limites), {"PFT", "PCIDADE"})
+        casos = (("PFT", ()), ("PCIDADE", ()), ("PCIDADE", ("Davi",)))
+        for procuradoria, names in casos:
+            with self.subTest(procuradoria=procuradoria, names=names):
+                self.assertMatches(
+                    procuradoria, names, datetime.date(2024, 1, 1),
+                    datetime.date(2024, 12, 31),
+                )
+
+    def test_replace_removes_procuradorias_without_rows(self) -> None:
+        indice = cubo.replace(self.indice, ("PCIDADE",), self.dados.iloc[:0])
+        self.assertEqual(set(indice.limites), {"PFT"})
+        self.assertEqual(len(indice.dados), 7)
+
+    def test_empty_cube(self) -> None:
+        indice = cubo.index(self.dados.iloc[:0])
+        self.assertTrue(cubo.counts_by_name(
+            indice, "PFT", ("Ana",), datetime.date(2024, 1, 1),
+            datetime.date(2024, 12, 31),
+        ).empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,595 @@
+"""Acesso aos dados do dashboard."""
+
+import contextlib
+import datetime
+import functools
+import os
+from collections.abc import Iterator
+
+import dotenv
+import pandas as pd
+import pymysql
+import pymysql.cursors
+import streamlit as st
+from pymysql.constants import CR
+
+import cubo
+import frames
+import profiling
+from mirror import Mirror
+from pool import ConnectionPool
+from probe import ChangeProbe
+from refresher import Refresher, Snapshot
+from singleflight import SingleFlight
+
+dotenv.load_dotenv()
+
+# Informações de conexão com o banco de dados
+host = os.getenv("DB_HOST")
+user = os.getenv("DB_USER")
+password = os.getenv("DB_PASSWORD") or ""
+database = os.getenv("DB_DATABASE")
+
+# Tempo (em segundos) que os dados ficam em cache antes de nova consulta;
+# as mudanças no banco são percebidas antes disso pela sonda abaixo
+CACHE_TTL = int(os.getenv("DB_CACHE_TTL", "3600"))
+
+# Intervalo mínimo (em segundos) entre duas verificações de mudanças
+PROBE_INTERVAL = float(os.getenv("DB_PROBE_INTERVAL", "30"))
+
+# Pool de conexões compartilhado entre as sessões
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "300"))
+
+# Limites de tempo (em segundos) da conexão e de cada leitura do socket
+CONNECT_TIMEOUT = float(os.getenv("DB_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("DB_READ_TIMEOUT", "30"))
+
+# Tempo máximo (em segundos) de execução de cada consulta no servidor,
+# abaixo do de leitura para o servidor desistir antes do cliente; 0 desliga
+MAX_EXECUTION_TIME = float(os.getenv("DB_MAX_EXECUTION_TIME", "25"))
+
+# Tempo máximo de execução das cargas em segundo plano (cubo e sonda), que
+# nenhuma página espera; abaixo do limite de leitura das consultas longas
+LONG_MAX_EXECUTION_TIME = float(os.getenv("DB_LONG_MAX_EXECUTION_TIME", "300"))
+
+# Limite de leitura das consultas longas, que rodam com o limite acima ou
+# sem limite (exportação e primeira cópia do espelho), em conexões próprias
+LONG_READ_TIMEOUT = float(os.getenv("DB_LONG_READ_TIMEOUT", "600"))
+
+# Tempo máximo (em segundos) de espera por uma carga idêntica em andamento
+LOAD_WAIT_TIMEOUT = float(os.getenv("DB_LOAD_WAIT_TIMEOUT", "60"))
+
+# Quantidade de linhas lidas do servidor por vez
+FETCH_CHUNK_SIZE = int(os.getenv("DB_FETCH_CHUNK_SIZE", "10000"))
+
+# Pasta do espelho local em Parquet; sem ela as páginas consultam o banco
+MIRROR_DIR = os.getenv("ANDAMENTOS_MIRROR_DIR")
+
+
+def has_credentials() -> bool:
+    """Return whether the database connection settings are available."""
+    return bool(host and user and database)
+
+
+def connect(read_timeout: float = READ_TIMEOUT) -> pymysql.connections.Connection:
+    """Open a new connection to the dashboard database."""
+    return pymysql.connect(
+        host=host,
+        port=3306,
+        user=user,
+        password=password,
+        database=database,
+        # Cada consulta enxerga os dados atuais, mesmo numa conexão reusada
+        autocommit=True,
+        connect_timeout=CONNECT_TIMEOUT,
+        read_timeout=read_timeout,
+        write_timeout=read_timeout,
+    )
+
+
+def _time_limited(query: str, max_time: float) -> str:
+    """Add a ``MAX_EXECUTION_TIME`` hint of ``max_time`` seconds to a SELECT.
+
+    Servers without the hint (MariaDB, MySQL before 5.7.8) read it as a
+    comment and run the query unlimited.
+    """
+    if max_time <= 0 or not query.lstrip().upper().startswith("SELECT"):
+        return query
+    inicio = query.upper().index("SELECT") + len("SELECT")
+    return (
+        f"{query[:inicio]} /*+ MAX_EXECUTION_TIME({int(max_time * 1000)}) */"
+        f"{query[inicio:]}"
+    )
+
+
+def _cancel(thread_id: int) -> None:
+    """Ask the server to stop the query running on connection ``thread_id``.
+
+    Used when the client gave up reading, since the server would otherwise
+    keep running the query for nobody. Failures are ignored.
+    """
+    with contextlib.suppress(pymysql.MySQLError, OSError):
+        conn = connect()
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("KILL QUERY %s", (thread_id,))
+        finally:
+            conn.close()
+
+
+@contextlib.contextmanager
+def _cancelling(conn: pymysql.connections.Connection) -> Iterator[None]:
+    """Cancel the query of ``conn`` on the server if reading it timed out."""
+    try:
+        yield
+    except pymysql.err.OperationalError as e:
+        if e.args and e.args[0] == CR.CR_SERVER_LOST:
+            _cancel(conn.thread_id())
+        raise
+
+
+@st.cache_resource
+def get_pool() -> ConnectionPool:
+    """Return the connection pool shared by every session of the process."""
+    return ConnectionPool(
+        connect,
+        size=POOL_SIZE,
+        timeout=POOL_TIMEOUT,
+        max_idle=POOL_MAX_IDLE,
+    )
+
+
+def _names_clause(names: tuple[str, ...] | None, params: list) -> str:
+    """Return an ``AND name IN (...)`` clause and extend ``params``."""
+    if not names:
+        return ""
+    params.extend(names)
+    return " AND name IN (" + ", ".join(["%s"] * len(names)) + ")"
+
+
+def iter_frames(
+    query: str,
+    params: list | tuple = (),
+    chunk_size: int | None = None,
+    max_time: float | None = None,
+) -> Iterator[pd.DataFrame]:
+    """Run ``query`` and yield the result in DataFrames of ``chunk_size`` rows.
+
+    Rows are streamed with an unbuffered (server-side) cursor, so only one
+    chunk of Python tuples exists at a time; each chunk is converted to
+    the typed columns of :data:`frames.DTYPES` right away. The first chunk is
+    yielded even if empty, so the columns are always known.
+
+    The server stops the query after ``max_time`` seconds (by default
+    ``MAX_EXECUTION_TIME``; 0 means no server limit). A query allowed to run
+    longer than ``MAX_EXECUTION_TIME`` runs on a connection of its own,
+    outside the pool, whose reads wait up to ``LONG_READ_TIMEOUT`` seconds
+    instead of ``READ_TIMEOUT``. If a read times out on the client, the
+    query is cancelled on the server before the error is raised.
+    """
+    chunk_size = chunk_size or FETCH_CHUNK_SIZE
+    if max_time is None:
+        max_time = MAX_EXECUTION_TIME
+    with contextlib.ExitStack() as pilha:
+        with profiling.stage("conexao"):
+            if 0 < max_time <= MAX_EXECUTION_TIME:
+                conn = pilha.enter_context(get_pool().connection())
+            else:
+                conn = pilha.enter_context(
+                    contextlib.closing(connect(LONG_READ_TIMEOUT)),
+                )
+            cursor = pilha.enter_context(conn.cursor(pymysql.cursors.SSCursor))
+
+        with profiling.stage("consulta"), _cancelling(conn):
+            cursor.execute(_time_limited(query, max_time), params)
+        colunas = [desc[0] for desc in cursor.description]
+
+        primeiro = True
+        while True:
+            with profiling.stage("leitura") as etapa, _cancelling(conn):
+                linhas = cursor.fetchmany(chunk_size)
+                etapa.linhas = len(linhas)
+            if not linhas and not primeiro:
+                return
+            primeiro = False
+
+            with profiling.stage("dataframe") as etapa:
+                chunk = frames.typed(pd.DataFrame(linhas, columns=colunas))
+                etapa.linhas = len(chunk)
+            etapa.medir_bytes(chunk)
+            yield chunk
+            if len(linhas) < chunk_size:
+                return
+
+
+def read_frame(
+    query: str,
+    params: list | tuple = (),
+    chunk_size: int | None = None,
+    max_time: float | None = None,
+) -> pd.DataFrame:
+    """Run ``query`` and return the result as a DataFrame.
+
+    Built from the typed chunks of :func:`iter_frames` instead of a full
+    ``fetchall`` list of tuples, which roughly halves the peak memory.
+    Concurrent calls with the same query and parameters, as when many
+    sessions open the same page at once, share a single run on the server.
+    """
+    return get_flights().run(
+        " ".join(query.split()),
+        (query, tuple(params), max_time),
+        lambda: frames.concat(iter_frames(query, params, chunk_size, max_time)),
+    )
+
+
+@st.cache_resource
+def get_flights() -> SingleFlight:
+    """Return the coalescer of the queries of every session of the process."""
+    return SingleFlight(LOAD_WAIT_TIMEOUT)
+
+
+def load_stats() -> pd.DataFrame:
+    """Return how many times each query ran, was shared and timed out."""
+    return get_flights().stats()
+
+
+@st.cache_resource
+def get_mirror() -> Mirror | None:
+    """Return the local ANDAMENTOS mirror, or None when it is disabled."""
+    if not MIRROR_DIR:
+        return None
+    # A primeira sincronização copia a tabela inteira: sem o limite de
+    # execução e com o limite de leitura das consultas longas
+    return Mirror(MIRROR_DIR, functools.partial(read_frame, max_time=0))
+
+
+def _read_mirrored(
+    procuradorias: tuple[str, ...] | None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame | None:
+    """Sync the mirror and read some procuradorias (or all) from it, if enabled."""
+    mirror = get_mirror()
+    if mirror is None:
+        return None
+    with profiling.stage("espelho") as etapa:
+        etapa.linhas = mirror.sync()
+    with profiling.stage("leitura_espelho") as etapa:
+        if procuradorias is None:
+            dados = mirror.read(None, columns)
+        else:
+            dados = frames.concat(
+                [mirror.read(procuradoria, columns) for procuradoria in procuradorias],
+            )
+        etapa.linhas = len(dados)
+    etapa.medir_bytes(dados)
+    return dados
+
+
+_DAILY_COUNTS_SELECT = (
+    "SELECT nome_procuradoria, DATE(datapub) AS dia, name,"
+    " COUNT(*) AS quantidade"
+    " FROM ANDAMENTOS"
+)
+_DAILY_COUNTS_GROUP = (
+    " GROUP BY nome_procuradoria, dia, name"
+    " ORDER BY nome_procuradoria, dia, name"
+)
+DAILY_COUNTS_QUERY = _DAILY_COUNTS_SELECT + _DAILY_COUNTS_GROUP
+
+
+def daily_counts_query(procuradorias: tuple[str, ...]) -> tuple[str, list]:
+    """Return the SQL and parameters of the cube rows of ``procuradorias``."""
+    params = list(procuradorias)
+    where = (
+        " WHERE nome_procuradoria IN ("
+        + ", ".join(["%s"] * len(procuradorias))
+        + ")"
+    )
+    return _DAILY_COUNTS_SELECT + where + _DAILY_COUNTS_GROUP, params
+
+
+def _publications_filter(
+    procuradoria: str,
+    names: tuple[str, ...] | None,
+    start: datetime.date | None,
+    end: datetime.date | None,
+    params: list,
+) -> str:
+    """Return the WHERE clause of the publications within ``[start, end)``."""
+    params.append(procuradoria)
+    where = " WHERE nome_procuradoria=%s"
+    if start is not None:
+        params.append(start)
+        where += " AND datapub >= %s"
+    if end is not None:
+        params.append(end)
+        where += " AND datapub < %s"
+    return where + _names_clause(names, params)
+
+
+def publications_query(
+    procuradoria: str,
+    names: tuple[str, ...] | None,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    after: tuple[datetime.datetime, int] | None,
+    limit: int,
+) -> tuple[str, list]:
+    """Return the SQL and parameters of :func:`load_publications`."""
+    params: list = []
+    query = "SELECT * FROM ANDAMENTOS"
+    query += _publications_filter(procuradoria, names, start, end, params)
+    if after is not None:
+        # Continuar logo depois da última linha da página anterior
+        query += " AND (datapub > %s OR (datapub = %s AND id > %s))"
+        params.extend([after[0], after[0], after[1]])
+    query += " ORDER BY datapub, id LIMIT %s"
+    params.append(limit)
+    return query, params
+
+
+def export_query(
+    procuradoria: str,
+    names: tuple[str, ...] | None = None,
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+) -> tuple[str, list]:
+    """Return the SQL and parameters of every publication in ``[start, end]``.
+
+    Without dates, the whole history of the procuradoria is selected.
+    """
+    params: list = []
+    query = "SELECT * FROM ANDAMENTOS"
+    query += _publications_filter(
+        procuradoria,
+        names,
+        start,
+        end + datetime.timedelta(days=1) if end is not None else None,
+        params,
+    )
+    return query + " ORDER BY datapub, id", params
+
+
+# Versão que vale para todas as procuradorias
+_TODAS = "*"
+
+
+@st.cache_resource
+def _versions() -> dict[str, int]:
+    """Return the process-wide data version of each procuradoria."""
+    return {}
+
+
+def data_version(
+    procuradoria: str,
+    versions: tuple[tuple[str, int], ...] | None = None,
+) -> int:
+    """Return the data version of a procuradoria.
+
+    The version is part of every cache key, so bumping it in
+    :func:`invalidate` retires all cached results of the procuradoria,
+    whatever filters they were loaded with. Pass the ``versions`` of a
+    :func:`daily_counts` snapshot to get the version its data belongs to.
+    """
+    versions = dict(versions) if versions is not None else _versions()
+    # Os dois contadores só crescem, então a soma muda sempre que um deles muda
+    return versions.get(_TODAS, 0) + versions.get(procuradoria, 0)
+
+
+def data_versions() -> tuple[tuple[str, int], ...]:
+    """Return the data versions of all procuradorias, as a cache key."""
+    return tuple(sorted(_versions().items()))
+
+
+def _read_daily_counts(procuradorias: tuple[str, ...] | None = None) -> pd.DataFrame:
+    """Read the cube rows of some procuradorias, or of all of them."""
+    dados = _read_mirrored(procuradorias, ["nome_procuradoria", "datapub", "name"])
+    if dados is not None:
+        return cubo.from_rows(dados)
+
+    # Só a primeira carga do cubo e o botão de atualizar esperam por ele; as
+    # demais rodam em segundo plano, sem o limite das consultas das páginas
+    if procuradorias is None:
+        return read_frame(DAILY_COUNTS_QUERY, max_time=LONG_MAX_EXECUTION_TIME)
+    return read_frame(
+        *daily_counts_query(procuradorias), max_time=LONG_MAX_EXECUTION_TIME,
+    )
+
+
+def _update_daily_counts(
+    anterior: Snapshot[cubo.Indice],
+    versions: tuple[tuple[str, int], ...],
+) -> cubo.Indice:
+    """Reload the cube rows of the procuradorias whose version changed.
+
+    The whole cube is reloaded when every procuradoria was invalidated, or
+    when no version changed and the cube is just older than ``CACHE_TTL``.
+    """
+    antigas, novas = dict(anterior.key), dict(versions)
+    mudadas = tuple(sorted(
+        procuradoria
+        for procuradoria in antigas.keys() | novas.keys()
+        if antigas.get(procuradoria) != novas.get(procuradoria)
+    ))
+    if not mudadas or _TODAS in mudadas:
+        return cubo.index(_read_daily_counts())
+    return cubo.replace(anterior.value, mudadas, _read_daily_counts(mudadas))
+
+
+@st.cache_resource
+def _daily_counts_refresher() -> Refresher[cubo.Indice]:
+    """Return the holder of the daily cube shared by every session."""
+    return Refresher(
+        lambda: cubo.index(_read_daily_counts()),
+        CACHE_TTL,
+        update=_update_daily_counts,
+    )
+
+
+def daily_counts() -> Snapshot[cubo.Indice]:
+    """Return the indexed daily cube with the data versions it was loaded at.
+
+    The cube counts the publications per procuradoria, day and name (the
+    columns of :data:`cubo.COLUNAS`, with a null ``dia`` for rows without
+    ``datapub``), so its size depends on days × names, not on the number
+    of publications. It is shared by every session and must not be modified.
+
+    After the first load, a new data version (or a cube older than
+    ``CACHE_TTL``) is loaded by a background thread while every session
+    keeps getting the previous cube, so no page waits for the reload. Only
+    the rows of the procuradorias with a new version are read again.
+    Key derived caches with the snapshot ``key``, not with
+    :func:`data_versions`, which may already be newer than the cube. When a
+    load fails (see :func:`refresh_failed`), the last cube keeps being
+    served; only the very first load can raise.
+    """
+    with st.spinner("Carregando dados..."):
+        return _daily_counts_refresher().get(data_versions())
+
+
+def refresh_failed() -> bool:
+    """Return whether the last load of the daily cube failed.
+
+    While true, :func:`daily_counts` serves the last cube loaded, from
+    :attr:`Snapshot.loaded_on`.
+    """
+    return _daily_counts_refresher().failed
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _load_counts_all(
+    versions: tuple[tuple[str, int], ...],  # noqa: ARG001
+    granularidade: str,
+    _cubo: pd.DataFrame,
+) -> pd.DataFrame:
+    return cubo.counts_all(_cubo, granularidade)
+
+
+def load_counts_all(
+    granularidade: str = "mes",
+    snapshot: Snapshot[cubo.Indice] | None = None,
+) -> pd.DataFrame:
+    """Count the publications of every procuradoria per period.
+
+    Rolled up from the :func:`daily_counts` ``snapshot`` (by default, the
+    current one) and cached with its versions. Returns the columns
+    ``nome_procuradoria``, ``periodo`` (see :func:`frames.period_key`) and
+    ``quantidade``; rows without ``datapub`` are counted under a null
+    ``periodo``.
+    """
+    snapshot = snapshot or daily_counts()
+    return _load_counts_all(snapshot.key, granularidade, snapshot.value.dados)
+
+
+def load_counts(
+    procuradoria: str,
+    granularidade: str = "mes",
+    snapshot: Snapshot[cubo.Indice] | None = None,
+) -> pd.DataFrame:
+    """Count the publications of a procuradoria per period.
+
+    Returns the partition of :func:`load_counts_all` for the procuradoria,
+    without the ``nome_procuradoria`` column.
+    """
+    todas = load_counts_all(granularidade, snapshot)
+    return (
+        todas[todas["nome_procuradoria"] == procuradoria]
+        .drop(columns="nome_procuradoria")
+        .reset_index(drop=True)
+    )
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _load_publications(
+    procuradoria: str,
+    names: tuple[str, ...] | None,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    after: tuple[datetime.datetime, int] | None,
+    limit: int,
+    version: int,  # noqa: ARG001
+) -> pd.DataFrame:
+    return read_frame(
+        *publications_query(procuradoria, names, start, end, after, limit),
+    )
+
+
+def load_publications(
+    procuradoria: str,
+    names: tuple[str, ...] | None,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    after: tuple[datetime.datetime, int] | None = None,
+    limit: int = 50,
+) -> pd.DataFrame:
+    """Load one page of the raw publications within ``[start, end)``.
+
+    Rows come ordered by ``(datapub, id)``; pass the last pair of a page as
+    ``after`` to get the next one. This keyset pagination reads only the
+    rows of the page, unlike ``OFFSET``, which scans every skipped row.
+    """
+    return _load_publications(
+        procuradoria, names, start, end, after, limit,
+        data_version(procuradoria),
+    )
+
+
+def page_cursor(linha: pd.Series) -> tuple[datetime.datetime, int]:
+    """Return the ``after`` key of :func:`load_publications` for a row."""
+    return linha["datapub"].to_pydatetime(), int(linha["id"])
+
+
+def invalidate(procuradoria: str | None = None) -> None:
+    """Drop cached data for one procuradoria, or everything if not given."""
+    if procuradoria is None:
+        for loader in (_load_counts_all, _load_publications):
+            loader.clear()
+        # Recarregar tudo é pedido explícito: esperar pelo cubo novo, que
+        # só é trocado pelo anterior se a carga falhar
+        _daily_counts_refresher().expire()
+
+    # Entradas antigas deixam de ser usadas e expiram pelo TTL, inclusive
+    # as que ficam fora deste módulo, como os gráficos das páginas
+    versions = _versions()
+    chave = _TODAS if procuradoria is None else procuradoria
+    versions[chave] = versions.get(chave, 0) + 1
+
+
+@st.cache_resource
+def get_probe() -> ChangeProbe:
+    """Return the change probe shared by every session of the process."""
+    return ChangeProbe(
+        functools.partial(read_frame, max_time=LONG_MAX_EXECUTION_TIME),
+        PROBE_INTERVAL,
+    )
+
+
+def check_changes() -> None:
+    """Invalidate the cached data of the procuradorias changed in the database.
+
+    Starts the query of :class:`ChangeProbe` in the background at most once
+    every ``PROBE_INTERVAL`` seconds, so the page never waits for it. Only
+    the procuradorias whose rows changed get a new data version: the next
+    page run reloads just their rows of the cube, and the data, tables and
+    charts of the others stay cached. If the probe fails, the cached data
+    is kept.
+    """
+    get_probe().start(_invalidate_changed)
+
+
+def _invalidate_changed(mudadas: list[str]) -> None:
+    for procuradoria in mudadas:
+        invalidate(procuradoria)
+
+
+def refresh_button(procuradoria: str) -> None:
+    """Render a sidebar button that reloads the page data from the database.
+
+    Unlike a change found by :func:`check_changes`, the click waits for the
+    new cube, falling back to the current one if the load fails.
+    """
+    if st.sidebar.button("Atualizar dados"):
+        invalidate(procuradoria)
+        _daily_counts_refresher().expire()
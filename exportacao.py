@@ -0,0 +1,91 @@
+"""Exportação das publicações filtradas, gravada em blocos."""
+
+import datetime
+import tempfile
+from collections.abc import Iterable
+from typing import BinaryIO
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import db
+
+# Tipo MIME de cada formato de exportação
+FORMATOS = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def write_csv(chunks: Iterable[pd.DataFrame], destino: BinaryIO) -> None:
+    """Write the chunks as one CSV file, with the header only once."""
+    for numero, chunk in enumerate(chunks):
+        chunk.to_csv(destino, header=numero == 0, index=False, encoding="utf-8")
+
+
+def write_parquet(chunks: Iterable[pd.DataFrame], destino: BinaryIO) -> None:
+    """Write the chunks as the row groups of one Parquet file."""
+    escritor = None
+    try:
+        for chunk in chunks:
+            tabela = pa.Table.from_pandas(chunk, preserve_index=False)
+            if escritor is None:
+                escritor = pq.ParquetWriter(destino, _esquema(tabela.schema))
+            escritor.write_table(tabela.cast(escritor.schema))
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+
+# Função que grava cada formato
+ESCRITORES = {
+    "csv": write_csv,
+    "parquet": write_parquet,
+}
+
+
+def export(
+    formato: str,
+    procuradoria: str,
+    names: tuple[str, ...] | None = None,
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+) -> bytes:
+    """Export the publications of a procuradoria within ``[start, end]``.
+
+    The rows are streamed from the database by :func:`db.iter_frames` and
+    written chunk by chunk to a temporary file, so neither the full result
+    set nor a full DataFrame is ever held in memory; only the finished file
+    is read back for the download.
+    """
+    with tempfile.TemporaryFile() as arquivo:
+        ESCRITORES[formato](
+            # O download roda fora da página: sem o limite de execução das
+            # consultas dela e com o limite de leitura das consultas longas
+            db.iter_frames(
+                *db.export_query(procuradoria, names, start, end), max_time=0,
+            ),
+            arquivo,
+        )
+        arquivo.seek(0)
+        return arquivo.read()
+
+
+def _esquema(esquema: pa.Schema) -> pa.Schema:
+    """Return the file schema for chunks shaped like ``esquema``.
+
+    Dictionary (categorical) columns are decoded, since their types vary
+    per chunk. A column that is all null in the first chunk has the ``null``
+    type, to which later values cannot be cast; the columns of ANDAMENTOS
+    outside :data:`frames.DTYPES` are text, so it is written as text.
+    """
+    campos = []
+    for campo in esquema:
+        tipo = campo.type
+        if pa.types.is_dictionary(tipo):
+            tipo = tipo.value_type
+        if pa.types.is_null(tipo):
+            tipo = pa.large_string()
+        campos.append(campo.with_type(tipo))
+    return pa.schema(campos)
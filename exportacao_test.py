@@ -0,0 +1,69 @@
+"""Testes da exportação em blocos."""
+
+import io
+import unittest
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import exportacao
+import frames
+
+
+def _bloco(inicio: int, name: str | None, texto: str | None) -> pd.DataFrame:
+    """Return a typed chunk of two publications."""
+    return frames.typed(pd.DataFrame({
+        "id": [inicio, inicio + 1],
+        "nome_procuradoria": ["PFT", "PFT"],
+        "name": [name, name],
+        "datapub": ["2024-01-01 10:00:00", None],
+        "texto": [texto, texto],
+    }))
+
+
+class WriteParquetTest(unittest.TestCase):
+    def escrever(self, chunks: list[pd.DataFrame]) -> pa.Table:
+        destino = io.BytesIO()
+        exportacao.write_parquet(chunks, destino)
+        destino.seek(0)
+        return pq.read_table(destino)
+
+    def test_chunks_become_one_file(self) -> None:
+        tabela = self.escrever([_bloco(1, "Ana", "a"), _bloco(3, "Bia", "b")])
+        self.assertEqual(tabela.column("id").to_pylist(), [1, 2, 3, 4])
+        self.assertEqual(
+            tabela.column("name").to_pylist(), ["Ana", "Ana", "Bia", "Bia"],
+        )
+        self.assertTrue(pa.types.is_timestamp(tabela.schema.field("datapub").type))
+
+    def test_all_null_columns_in_the_first_chunk(self) -> None:
+        tabela = self.escrever([_bloco(1, None, None), _bloco(3, "Bia", "b")])
+        self.assertEqual(
+            tabela.column("name").to_pylist(), [None, None, "Bia", "Bia"],
+        )
+        self.assertEqual(tabela.column("texto").to_pylist(), [None, None, "b", "b"])
+
+    def test_all_null_columns_in_a_later_chunk(self) -> None:
+        tabela = self.escrever([_bloco(1, "Ana", "a"), _bloco(3, None, None)])
+        self.assertEqual(
+            tabela.column("name").to_pylist(), ["Ana", "Ana", None, None],
+        )
+
+    def test_empty_result(self) -> None:
+        tabela = self.escrever([_bloco(1, "Ana", "a").iloc[:0]])
+        self.assertEqual(tabela.num_rows, 0)
+        self.assertEqual(tabela.column_names, list(_bloco(1, "Ana", "a").columns))
+
+
+class WriteCsvTest(unittest.TestCase):
+    def test_header_is_written_once(self) -> None:
+        destino = io.BytesIO()
+        exportacao.write_csv([_bloco(1, "Ana", "a"), _bloco(3, "Bia", "b")], destino)
+        linhas = destino.getvalue().decode().splitlines()
+        self.assertEqual(linhas[0], "id,nome_procuradoria,name,datapub,texto")
+        self.assertEqual(len(linhas), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
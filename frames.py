@@ -0,0 +1,160 @@
+"""Tipos e transformações dos DataFrames de andamentos."""
+
+from collections.abc import Iterable
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# Tipos das colunas conhecidas, aplicados a cada bloco lido
+DTYPES = {
+    "id": "int64",
+    "quantidade": "int64",
+    "datapub": "datetime64[ns]",
+    "dia": "datetime64[ns]",
+    "name": "category",
+    "nome_procuradoria": "category",
+}
+
+
+def typed(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Convert the known columns of ``chunk`` to their compact types."""
+    tipos = {col: tipo for col, tipo in DTYPES.items() if col in chunk.columns}
+    return chunk.astype(tipos) if tipos else chunk
+
+
+def concat(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate typed chunks, keeping categorical columns categorical.
+
+    ``pd.concat`` falls back to ``object`` when the chunks have different
+    categories, so those columns are merged with ``union_categoricals``.
+    """
+    chunks = list(chunks)
+    if len(chunks) == 1:
+        return chunks[0]
+
+    colunas = {}
+    for col in chunks[0].columns:
+        partes = [chunk[col] for chunk in chunks]
+        if all(isinstance(parte.dtype, pd.CategoricalDtype) for parte in partes):
+            colunas[col] = _concat_categorical(partes)
+        else:
+            colunas[col] = pd.concat(partes, ignore_index=True)
+    return pd.DataFrame(colunas)
+
+
+def _concat_categorical(partes: list[pd.Series]) -> pd.Series:
+    """Concatenate categorical series whose categories may differ."""
+    # Um bloco só de nulos não tem categorias, e o tipo delas (object) não
+    # é o dos outros blocos (str); union_categoricals exige o mesmo tipo
+    tipos = {
+        parte.cat.categories.dtype for parte in partes if len(parte.cat.categories)
+    }
+    if len(tipos) > 1:
+        return pd.concat(partes, ignore_index=True).astype("category")
+    if tipos:
+        vazio = pd.CategoricalDtype(pd.Index([], dtype=tipos.pop()))
+        partes = [
+            parte if len(parte.cat.categories) else parte.astype(vazio)
+            for parte in partes
+        ]
+    return pd.Series(union_categoricals(partes), name=partes[0].name)
+
+
+def _datetimes(datas: pd.Series) -> pd.Series:
+    """Convert ``datas`` to datetimes, unless they already are."""
+    # O to_datetime percorre (e deduplica) até colunas que já são datas
+    if pd.api.types.is_datetime64_any_dtype(datas):
+        return datas
+    return pd.to_datetime(datas)
+
+
+def month_key(datapub: pd.Series) -> pd.Series:
+    """Return ``ano * 12 + mês - 1`` for each date, as a nullable integer."""
+    datapub = _datetimes(datapub)
+    return (datapub.dt.year * 12 + datapub.dt.month - 1).astype("Int64")
+
+
+def month_label(mes: pd.Series) -> pd.Series:
+    """Return the ``AAAA-MM`` label of each month key."""
+    mes = mes.astype("int64")
+    return (
+        (mes // 12).astype(str)
+        + "-"
+        + (mes % 12 + 1).astype(str).str.zfill(2)
+    )
+
+
+# Agrupamentos de tempo, do mais fino ao mais grosso
+GRANULARITIES = ("dia", "semana", "mes", "trimestre")
+
+# Rótulos de cada granularidade, no seletor e nos eixos
+ROTULOS_PERIODO = {
+    "dia": "Dia",
+    "semana": "Semana",
+    "mes": "Mês",
+    "trimestre": "Trimestre",
+}
+
+# Complemento do título dos gráficos ("Publicações Mensais")
+TITULOS_PERIODO = {
+    "dia": "Diárias",
+    "semana": "Semanais",
+    "mes": "Mensais",
+    "trimestre": "Trimestrais",
+}
+
+_EPOCA = pd.Timestamp("1970-01-01")
+
+
+def period_key(datas: pd.Series, granularidade: str) -> pd.Series:
+    """Return the integer key of the period of each date, as a nullable integer.
+
+    Days and weeks (starting on Monday) are counted from 1970-01-01, months
+    use :func:`month_key` and quarters ``ano * 4 + trimestre - 1``, so
+    consecutive periods always have consecutive keys.
+    """
+    datas = _datetimes(datas)
+    if granularidade == "mes":
+        return month_key(datas)
+    if granularidade == "trimestre":
+        return (datas.dt.year * 4 + (datas.dt.month - 1) // 3).astype("Int64")
+    dias = (datas - _EPOCA).dt.days.astype("Int64")
+    if granularidade == "semana":
+        # 1970-01-01 foi uma quinta-feira
+        return (dias + 3) // 7
+    if granularidade == "dia":
+        return dias
+    msg = f"Granularidade desconhecida: {granularidade}"
+    raise ValueError(msg)
+
+
+def period_label(chave: pd.Series, granularidade: str) -> pd.Series:
+    """Return the label of each period key (``AAAA-MM``, ``AAAA-T1`` or a date).
+
+    Weeks are labelled by the date of their Monday.
+    """
+    chave = chave.astype("int64")
+    if granularidade == "mes":
+        return month_label(chave)
+    if granularidade == "trimestre":
+        return (chave // 4).astype(str) + "-T" + (chave % 4 + 1).astype(str)
+    dias = chave * 7 - 3 if granularidade == "semana" else chave
+    return (_EPOCA + pd.to_timedelta(dias, unit="D")).dt.strftime("%Y-%m-%d")
+
+
+def period_start(chave: int, granularidade: str) -> pd.Timestamp:
+    """Return the first instant of the period with key ``chave``."""
+    if granularidade == "mes":
+        return pd.Timestamp(year=chave // 12, month=chave % 12 + 1, day=1)
+    if granularidade == "trimestre":
+        return pd.Timestamp(year=chave // 4, month=chave % 4 * 3 + 1, day=1)
+    dias = chave * 7 - 3 if granularidade == "semana" else chave
+    return _EPOCA + pd.Timedelta(days=dias)
+
+
+def period_span(chave: pd.Series) -> int:
+    """Return how many periods lie between the first and last key, inclusive."""
+    chave = chave.dropna()
+    if chave.empty:
+        return 0
+    return int(chave.max() - chave.min()) + 1
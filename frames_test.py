@@ -0,0 +1,98 @@
+"""Testes da concatenação de blocos tipados."""
+
+import unittest
+
+import pandas as pd
+
+import frames
+
+
+class ConcatTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.nomes = frames.typed(pd.DataFrame({"name": ["Ana", "Bia"], "id": [1, 2]}))
+        self.nulos = frames.typed(pd.DataFrame({"name": [None, None], "id": [3, 4]}))
+
+    def test_chunks_with_different_categories_stay_categorical(self) -> None:
+        outros = frames.typed(pd.DataFrame({"name": ["Caio"], "id": [5]}))
+        resultado = frames.concat([self.nomes, outros])
+        self.assertIsInstance(resultado["name"].dtype, pd.CategoricalDtype)
+        self.assertEqual(list(resultado["name"]), ["Ana", "Bia", "Caio"])
+
+    def test_all_null_chunk(self) -> None:
+        for chunks in ([self.nomes, self.nulos], [self.nulos, self.nomes]):
+            with self.subTest(primeiro=chunks[0]["name"].iloc[0]):
+                resultado = frames.concat(chunks)
+                self.assertIsInstance(resultado["name"].dtype, pd.CategoricalDtype)
+                self.assertEqual(
+                    sorted(resultado["name"].dropna()), ["Ana", "Bia"],
+                )
+                self.assertEqual(int(resultado["name"].isna().sum()), 2)
+                self.assertEqual(sorted(resultado["id"]), [1, 2, 3, 4])
+
+
+class PeriodTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.datas = pd.Series(pd.to_datetime([
+            "2024-01-01 00:00", "2024-01-07 23:59", "2024-01-08 10:00",
+            "2024-03-31 00:00", "2024-04-01 00:00", None,
+        ]))
+
+    def rotulos(self, granularidade: str) -> list[str]:
+        chave = frames.period_key(self.datas, granularidade)
+        return list(frames.period_label(chave.dropna(), granularidade))
+
+    def test_labels(self) -> None:
+        esperados = {
+            "dia": [
+                "2024-01-01", "2024-01-07", "2024-01-08", "2024-03-31",
+                "2024-04-01",
+            ],
+            # Semanas começam na segunda-feira
+            "semana": [
+                "2024-01-01", "2024-01-01", "2024-01-08", "2024-03-25",
+                "2024-04-01",
+            ],
+            "mes": ["2024-01", "2024-01", "2024-01", "2024-03", "2024-04"],
+            "trimestre": ["2024-T1", "2024-T1", "2024-T1", "2024-T1", "2024-T2"],
+        }
+        for granularidade, rotulos in esperados.items():
+            with self.subTest(granularidade=granularidade):
+                self.assertEqual(self.rotulos(granularidade), rotulos)
+
+    def test_missing_dates_have_no_key(self) -> None:
+        for granularidade in frames.GRANULARITIES:
+            with self.subTest(granularidade=granularidade):
+                chave = frames.period_key(self.datas, granularidade)
+                self.assertTrue(pd.isna(chave.iloc[-1]))
+
+    def test_start_is_the_first_instant_of_the_period(self) -> None:
+        for granularidade in frames.GRANULARITIES:
+            chaves = frames.period_key(self.datas, granularidade).dropna()
+            for data, chave in zip(self.datas.dropna(), chaves, strict=True):
+                with self.subTest(granularidade=granularidade, data=data):
+                    inicio = frames.period_start(int(chave), granularidade)
+                    self.assertEqual(inicio, inicio.normalize())
+                    self.assertLessEqual(inicio, data)
+                    anterior = inicio - pd.Timedelta(microseconds=1)
+                    self.assertEqual(
+                        int(frames.period_key(pd.Series([anterior]), granularidade)[0]),
+                        int(chave) - 1,
+                    )
+
+    def test_span_counts_consecutive_keys(self) -> None:
+        spans = {
+            granularidade: frames.period_span(
+                frames.period_key(self.datas, granularidade),
+            )
+            for granularidade in frames.GRANULARITIES
+        }
+        self.assertEqual(spans, {"dia": 92, "semana": 14, "mes": 4, "trimestre": 2})
+        self.assertEqual(frames.period_span(pd.Series([], dtype="Int64")), 0)
+
+    def test_unknown_granularity(self) -> None:
+        with self.assertRaises(ValueError):
+            frames.period_key(self.datas, "ano")
+
+
+if __name__ == "__main__":
+    unittest.main()
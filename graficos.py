@@ -0,0 +1,126 @@
+"""Gráficos das páginas (Plotly e pyecharts), importados só quando usados."""
+
+import json
+
+import pandas as pd
+import plotly.express as px  # type: ignore  # noqa: PGH003
+import plotly.graph_objects as go  # type: ignore  # noqa: PGH003
+from pyecharts import options as opts
+from pyecharts.charts import Bar
+
+from cubo import Resumo
+from frames import ROTULOS_PERIODO, TITULOS_PERIODO
+
+
+def figura_barras_mensais(resumo: Resumo, granularidade: str) -> go.Figure:
+    """Build the Plotly bar chart of the totals per period."""
+    rotulo = ROTULOS_PERIODO[granularidade]
+    # Criar gráfico de barras com Plotly Express
+    return px.bar(
+        resumo.por_periodo.rename(
+            columns={"periodo": rotulo, "quantidade": "Quantidade"},
+        ),
+        x=rotulo,
+        y="Quantidade",
+        title=f"Publicações {TITULOS_PERIODO[granularidade]}",
+        labels={
+            rotulo: rotulo,
+            "Quantidade": "Quantidade de Publicações",
+        },
+        height=400,
+    )
+
+
+def figura_pizza_por_nome(
+    resumo: Resumo,
+    granularidade: str,  # noqa: ARG001
+) -> go.Figure:
+    """Build the donut chart of each name's share of the publications."""
+    return px.pie(
+        resumo.por_nome.rename(columns={"name": "Nome", "quantidade": "Quantidade"}),
+        names="Nome",
+        values="Quantidade",
+        title="Distribuição de Publicações por Usuário",
+        hole=0.4,
+    )
+
+
+def figura_barras_mensais_echarts(resumo: Resumo, granularidade: str) -> Bar:
+    """Build the pyecharts bar chart of the totals of all names per period."""
+    return (
+        Bar()
+        .add_xaxis(resumo.por_periodo["periodo"].tolist())
+        .add_yaxis(
+            "Quantidade de Publicações",
+            resumo.por_periodo["quantidade"].tolist(),
+        )
+        .set_global_opts(
+            title_opts=opts.TitleOpts(
+                title=f"Publicações {TITULOS_PERIODO[granularidade]}",
+                subtitle=f"Total por {ROTULOS_PERIODO[granularidade].lower()}",
+            ),
+            toolbox_opts=opts.ToolboxOpts(),
+        )
+    )
+
+
+def figura_barras_mensais_por_nome(
+    resumo: Resumo,
+    granularidade: str,
+) -> go.Figure:
+    """Build the bar chart of the counts per period stacked by name."""
+    return px.bar(
+        resumo.por_periodo_nome,
+        x="periodo",
+        y="quantidade",
+        color="name",
+        title=f"Publicações {TITULOS_PERIODO[granularidade]} por Usuário",
+        text_auto=True,
+        labels={
+            "periodo": ROTULOS_PERIODO[granularidade],
+            "quantidade": "Quantidade",
+            "name": "Nome",
+        },
+    )
+
+
+def figura_visao_geral(periodos: pd.DataFrame, granularidade: str) -> go.Figure:
+    """Build the line chart of the series of every procuradoria."""
+    rotulo = ROTULOS_PERIODO[granularidade]
+    return px.line(
+        periodos,
+        x=rotulo,
+        y="Quantidade",
+        color="Procuradoria",
+        markers=True,
+        title=f"Publicações {TITULOS_PERIODO[granularidade]} por Procuradoria",
+        labels={"Quantidade": "Quantidade de Publicações"},
+        height=450,
+    )
+
+
+# Funções que montam cada gráfico: os das páginas recebem o resumo e o da
+# visão geral, a série já rotulada de cada procuradoria
+FIGURAS = {
+    "barras_mensais": figura_barras_mensais,
+    "pizza_por_nome": figura_pizza_por_nome,
+    "barras_mensais_echarts": figura_barras_mensais_echarts,
+    "barras_mensais_por_nome": figura_barras_mensais_por_nome,
+    "visao_geral": figura_visao_geral,
+}
+
+
+def especificacao(
+    nome: str,
+    dados: Resumo | pd.DataFrame,
+    granularidade: str,
+) -> dict:
+    """Build chart ``nome`` and return its serialized spec.
+
+    Plotly figures become their ``to_dict()`` form, for ``st.plotly_chart``;
+    pyecharts charts become their options, for ``st_echarts``.
+    """
+    figura = FIGURAS[nome](dados, granularidade)
+    if isinstance(figura, go.Figure):
+        return figura.to_dict()
+    return json.loads(figura.dump_options())
@@ -0,0 +1,170 @@
+"""Espelho local (Parquet) da tabela ANDAMENTOS."""
+
+import json
+import os
+import threading
+import urllib.parse
+from collections.abc import Callable
+from pathlib import Path
+
+import pandas as pd
+
+import frames
+
+WATERMARK_FILE = "_watermark.json"
+
+
+class Mirror:
+    """Columnar copy of ANDAMENTOS, partitioned by ``nome_procuradoria``.
+
+    The table only grows, so :meth:`sync` fetches just the rows whose
+    ``id`` is above the stored watermark and appends them as new Parquet
+    parts under ``<directory>/nome_procuradoria=<valor>/``. Partitions are
+    compacted into a single file once they pass ``max_parts`` parts.
+
+    The watermark is saved only after every partition has been written, so
+    a sync that fails halfway is fetched again in full; the parts it left
+    behind are removed before the next sync or read (see :meth:`_recover`).
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        fetch: Callable[[str, list], pd.DataFrame],
+        max_parts: int = 20,
+    ) -> None:
+        """Use ``fetch(query, params)`` to read new rows from the database."""
+        self._directory = Path(directory)
+        self._fetch = fetch
+        self._max_parts = max_parts
+        self._lock = threading.Lock()
+
+    @property
+    def watermark(self) -> int:
+        """Return the highest ``id`` of the last complete sync."""
+        arquivo = self._directory / WATERMARK_FILE
+        return json.loads(arquivo.read_text())["id"] if arquivo.exists() else 0
+
+    def sync(self) -> int:
+        """Append the rows added since the last sync; return how many."""
+        with self._lock:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            marca = self._recover()
+            novos = self._fetch(
+                "SELECT * FROM ANDAMENTOS WHERE id > %s ORDER BY id",
+                [marca],
+            )
+            if novos.empty:
+                return 0
+
+            for procuradoria, parte in novos.groupby(
+                "nome_procuradoria", sort=False,
+            ):
+                self._write_part(procuradoria, parte)
+
+            self._write_watermark(int(novos["id"].max()))
+            return len(novos)
+
+    def read(
+        self,
+        procuradoria: str | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """Read the mirrored rows of one procuradoria, or of all of them.
+
+        Holds the sync lock, so a compaction never removes parts between
+        listing and reading them, nor leaves rows in two listed parts.
+        """
+        with self._lock:
+            self._recover()
+            if procuradoria is None:
+                partes = sorted(self._directory.glob("*/part-*.parquet"))
+            else:
+                partes = sorted(
+                    self._partition(procuradoria).glob("part-*.parquet"),
+                )
+            if not partes:
+                return pd.DataFrame(columns=columns)
+            return frames.concat(
+                [pd.read_parquet(part, columns=columns) for part in partes],
+            )
+
+    def _partition(self, procuradoria: str) -> Path:
+        """Return the directory holding the parts of a procuradoria."""
+        valor = urllib.parse.quote(procuradoria, safe=" ")
+        return self._directory / f"nome_procuradoria={valor}"
+
+    def _write_part(self, procuradoria: str, parte: pd.DataFrame) -> None:
+        """Write new rows of one procuradoria, compacting when needed."""
+        pasta = self._partition(procuradoria)
+        pasta.mkdir(parents=True, exist_ok=True)
+        partes = sorted(pasta.glob("part-*.parquet"))
+
+        if len(partes) >= self._max_parts:
+            # Reescrever a partição inteira como uma parte só
+            parte = frames.concat(
+                [*(pd.read_parquet(part) for part in partes), parte],
+            )
+        else:
+            partes = []
+
+        # Até as antigas serem apagadas, a parte nova cobre as faixas delas
+        _write_rows(pasta, parte)
+        for antiga in partes:
+            antiga.unlink()
+
+    def _recover(self) -> int:
+        """Remove what an interrupted sync left behind; return the watermark.
+
+        Parts inside the id range of another part were merged by a
+        compaction that stopped before deleting them. Rows above the
+        watermark were written by a sync that failed before saving it, and
+        are fetched again by the next one.
+        """
+        marca = self.watermark
+        for pasta in self._directory.glob("nome_procuradoria=*"):
+            # Em ordem de início, a parte mais larga antes das que ela cobre
+            partes = sorted(
+                pasta.glob("part-*.parquet"),
+                key=lambda part: (_ids(part)[0], -_ids(part)[1]),
+            )
+            coberto = -1
+            for part in partes:
+                inicio, fim = _ids(part)
+                if fim <= coberto:
+                    part.unlink()
+                    continue
+                coberto = fim
+                if inicio > marca:
+                    part.unlink()
+                elif fim > marca:
+                    dados = pd.read_parquet(part)
+                    _write_rows(pasta, dados[dados["id"] <= marca])
+                    part.unlink()
+        return marca
+
+    def _write_watermark(self, marca: int) -> None:
+        """Persist the highest mirrored ``id``."""
+        arquivo = self._directory / WATERMARK_FILE
+        temporario = arquivo.with_suffix(".tmp")
+        temporario.write_text(json.dumps({"id": marca}))
+        temporario.replace(arquivo)
+
+
+def _ids(part: Path) -> tuple[int, int]:
+    """Return the first and last ``id`` of a part, from its file name."""
+    _, inicio, fim = part.stem.split("-")
+    return int(inicio), int(fim)
+
+
+def _write_rows(pasta: Path, dados: pd.DataFrame) -> None:
+    """Write ``dados`` as a part of ``pasta`` named after its id range."""
+    inicio, fim = int(dados["id"].min()), int(dados["id"].max())
+    _write_atomic(dados, pasta / f"part-{inicio:012d}-{fim:012d}.parquet")
+
+
+def _write_atomic(frame: pd.DataFrame, destino: Path) -> None:
+    """Write ``frame`` as Parquet so readers never see a partial file."""
+    temporario = destino.with_suffix(".tmp")
+    frame.to_parquet(temporario, index=False)
+    temporario.replace(destino)
@@ -0,0 +1,110 @@
+"""Testes do espelho local de ANDAMENTOS."""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+import frames
+import mirror
+from mirror import Mirror
+
+
+class Tabela:
+    """Stand-in for ANDAMENTOS, answering the mirror's sync query."""
+
+    def __init__(self) -> None:
+        self.linhas: list[tuple] = []
+
+    def inserir(self, *procuradorias: str) -> None:
+        for procuradoria in procuradorias:
+            id_ = len(self.linhas) + 1
+            self.linhas.append((id_, procuradoria, "Ana", f"2024-01-{id_:02d}"))
+
+    def __call__(self, query: str, params: list) -> pd.DataFrame:  # noqa: ARG002
+        dados = pd.DataFrame(
+            self.linhas, columns=["id", "nome_procuradoria", "name", "datapub"],
+        )
+        return frames.typed(dados[dados["id"] > params[0]].reset_index(drop=True))
+
+
+class MirrorTest(unittest.TestCase):
+    def setUp(self) -> None:
+        pasta = tempfile.TemporaryDirectory()
+        self.addCleanup(pasta.cleanup)
+        self.pasta = Path(pasta.name)
+        self.tabela = Tabela()
+
+    def espelho(self, max_parts: int = 20) -> Mirror:
+        """Return a new mirror of the directory, as after a restart."""
+        return Mirror(self.pasta, self.tabela, max_parts=max_parts)
+
+    def ids(self, espelho: Mirror, procuradoria: str | None = None) -> list[int]:
+        return sorted(int(id_) for id_ in espelho.read(procuradoria)["id"])
+
+    def partes(self) -> list[Path]:
+        return sorted(self.pasta.glob("*/part-*.parquet"))
+
+    def test_sync_fetches_only_new_rows(self) -> None:
+        espelho = self.espelho()
+        self.tabela.inserir("A", "B")
+        self.assertEqual(espelho.sync(), 2)
+        self.assertEqual(espelho.sync(), 0)
+        self.tabela.inserir("A")
+        self.assertEqual(espelho.sync(), 1)
+        self.assertEqual(espelho.watermark, 3)
+        self.assertEqual(self.ids(espelho), [1, 2, 3])
+        self.assertEqual(self.ids(espelho, "A"), [1, 3])
+
+    def test_interrupted_sync_is_fetched_again(self) -> None:
+        self.tabela.inserir("A", "B", "A")
+        gravar = mirror._write_atomic  # noqa: SLF001
+
+        def falhar_em_b(frame: pd.DataFrame, destino: Path) -> None:
+            if "nome_procuradoria=B" in str(destino):
+                raise OSError
+            gravar(frame, destino)
+
+        with (
+            mock.patch.object(mirror, "_write_atomic", falhar_em_b),
+            self.assertRaises(OSError),
+        ):
+            self.espelho().sync()
+        self.assertEqual(self.espelho().watermark, 0)
+
+        espelho = self.espelho()
+        self.assertEqual(espelho.sync(), 3)
+        self.assertEqual(self.ids(espelho), [1, 2, 3])
+
+    def test_partitions_are_compacted(self) -> None:
+        espelho = self.espelho(max_parts=2)
+        for _ in range(3):
+            self.tabela.inserir("A")
+            espelho.sync()
+        self.assertEqual(len(self.partes()), 1)
+        self.assertEqual(self.ids(espelho), [1, 2, 3])
+
+    def test_interrupted_compaction_does_not_duplicate_rows(self) -> None:
+        espelho = self.espelho(max_parts=2)
+        for _ in range(2):
+            self.tabela.inserir("A")
+            espelho.sync()
+        self.tabela.inserir("A")
+        with (
+            mock.patch.object(Path, "unlink", side_effect=OSError),
+            self.assertRaises(OSError),
+        ):
+            espelho.sync()
+        # A parte compactada e as que ela substitui ficaram no disco
+        self.assertEqual(len(self.partes()), 3)
+
+        espelho = self.espelho(max_parts=2)
+        self.assertEqual(self.ids(espelho), [1, 2])
+        self.assertEqual(espelho.sync(), 1)
+        self.assertEqual(self.ids(espelho), [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,536 @@
+"""Páginas do dashboard, montadas a partir do cadastro de procuradorias."""
+
+import datetime
+import functools
+from collections.abc import Callable
+
+import pandas as pd
+import pymysql
+import streamlit as st
+
+import cubo
+import db
+import exportacao
+import frames
+import profiling
+import tabelas
+from procuradorias import PROCURADORIAS, Procuradoria
+from refresher import Snapshot
+
+# Limite de períodos por série; acima dele os períodos ficam mais longos
+MAX_PONTOS = 200
+
+# Publicações por página na listagem do período
+LINHAS_DETALHE = 50
+
+
+@st.cache_data(ttl=db.CACHE_TTL, max_entries=256, show_spinner=False)
+def _especificacao(
+    nome: str,
+    granularidade: str,
+    chave: tuple,  # noqa: ARG001
+    _dados: cubo.Resumo | pd.DataFrame,
+) -> dict:
+    """Build chart ``nome`` and return its serialized spec.
+
+    ``chave`` identifies the data (procuradoria, filters and data version),
+    so the frame itself is left out of the cache key and a rerun with the
+    same inputs skips building and serializing the figure.
+    """
+    # As bibliotecas de gráficos só são carregadas no primeiro gráfico montado
+    with profiling.stage("importacao:graficos"):
+        import graficos  # noqa: PLC0415
+
+    return graficos.especificacao(nome, _dados, granularidade)
+
+
+def _detalhar(chave: str) -> None:
+    """Open the bar clicked on chart ``chave`` in the publications listing."""
+    pontos = st.session_state[chave].selection.points
+    if not pontos:
+        return
+    st.session_state["detalhe:periodo"] = pontos[0]["x"]
+    if pontos[0].get("legendgroup"):
+        st.session_state["detalhe:nome"] = pontos[0]["legendgroup"]
+
+
+def _grafico_detalhavel(spec: dict, chave: str) -> None:
+    """Show a Plotly bar chart whose bars open the publications listing."""
+    st.plotly_chart(
+        spec,
+        use_container_width=True,
+        key=chave,
+        on_select=functools.partial(_detalhar, chave),
+        selection_mode="points",
+    )
+
+
+def barras_mensais(
+    resumo: cubo.Resumo,
+    granularidade: str,
+    chave: tuple,
+) -> None:
+    """Plot the totals per period as a Plotly bar chart."""
+    with profiling.stage("figura:barras_mensais"):
+        spec = _especificacao("barras_mensais", granularidade, chave, resumo)
+    with profiling.stage("exibicao:barras_mensais"):
+        _grafico_detalhavel(spec, "grafico:barras_mensais")
+
+
+def tabela_mensal(
+    resumo: cubo.Resumo,
+    granularidade: str,
+    chave: tuple,  # noqa: ARG001
+) -> None:
+    """Show the totals per period as a table."""
+    st.subheader(f"Publicações {frames.TITULOS_PERIODO[granularidade]} Resumidas")
+    with profiling.stage("exibicao:tabela_mensal"):
+        tabelas.paginada(
+            _periodos_resumidos(resumo.por_periodo, granularidade), "tabela_mensal",
+        )
+
+
+def pizza_por_nome(
+    resumo: cubo.Resumo,
+    granularidade: str,
+    chave: tuple,
+) -> None:
+    """Plot each name's share of the publications as a donut chart."""
+    with profiling.stage("figura:pizza_por_nome"):
+        spec = _especificacao("pizza_por_nome", granularidade, chave, resumo)
+    with profiling.stage("exibicao:pizza_por_nome"):
+        st.plotly_chart(spec, height=500)
+
+
+def barras_mensais_echarts(
+    resumo: cubo.Resumo,
+    granularidade: str,
+    chave: tuple,
+) -> None:
+    """Plot the totals of all names per period with pyecharts."""
+    # O componente só pode ser registrado com o Streamlit em execução
+    from streamlit_echarts import st_echarts  # noqa: PLC0415
+
+    with profiling.stage("figura:barras_mensais_echarts"):
+        spec = _especificacao("barras_mensais_echarts", granularidade, chave, resumo)
+    with profiling.stage("exibicao:barras_mensais_echarts"):
+        st_echarts(options=spec)
+
+
+def barras_mensais_por_nome(
+    resumo: cubo.Resumo,
+    granularidade: str,
+    chave: tuple,
+) -> None:
+    """Plot the counts per period stacked by name."""
+    with profiling.stage("figura:barras_mensais_por_nome"):
+        spec = _especificacao("barras_mensais_por_nome", granularidade, chave, resumo)
+    st.subheader("Gráfico de Barras")
+    with profiling.stage("exibicao:barras_mensais_por_nome"):
+        _grafico_detalhavel(spec, "grafico:barras_mensais_por_nome")
+
+
+def tabela_mensal_por_nome(
+    resumo: cubo.Resumo,
+    granularidade: str,
+    chave: tuple,  # noqa: ARG001
+) -> None:
+    """Show the counts per period and name as a table."""
+    st.subheader("Tabela de Quantitativo por Período")
+    with profiling.stage("exibicao:tabela_mensal_por_nome"):
+        tabelas.paginada(
+            resumo.por_periodo_nome.rename(columns={
+                "periodo": frames.ROTULOS_PERIODO[granularidade],
+                "name": "Nome",
+                "quantidade": "Quantidade",
+            }),
+            "tabela_mensal_por_nome",
+        )
+
+
+# Gráficos que podem ser usados no cadastro das procuradorias
+GRAFICOS = {
+    "barras_mensais": barras_mensais,
+    "tabela_mensal": tabela_mensal,
+    "pizza_por_nome": pizza_por_nome,
+    "barras_mensais_echarts": barras_mensais_echarts,
+    "barras_mensais_por_nome": barras_mensais_por_nome,
+    "tabela_mensal_por_nome": tabela_mensal_por_nome,
+}
+
+
+def _periodos_resumidos(dados: pd.DataFrame, granularidade: str) -> pd.DataFrame:
+    """Return the totals per period with display column names."""
+    return dados.rename(
+        columns={
+            "periodo": frames.ROTULOS_PERIODO[granularidade],
+            "quantidade": "Quantidade",
+        },
+    )
+
+
+def _seletor_granularidade() -> str:
+    """Render the sidebar selector of the time granularity of the charts."""
+    return st.sidebar.selectbox(
+        "Agrupar por:",
+        options=frames.GRANULARITIES,
+        index=frames.GRANULARITIES.index("mes"),
+        format_func=frames.ROTULOS_PERIODO.get,
+    )
+
+
+def _carregar_periodos(
+    carregar: Callable[[str], pd.DataFrame],
+    granularidade: str,
+) -> tuple[pd.DataFrame, str]:
+    """Load counts with ``carregar(granularidade)`` within :data:`MAX_PONTOS`.
+
+    Starting at the chosen granularity, each coarser one is tried until the
+    series spans at most ``MAX_PONTOS`` periods, so a long range never sends
+    thousands of bars to the browser. Returns the counts and the
+    granularity actually used.
+    """
+    opcoes = frames.GRANULARITIES[frames.GRANULARITIES.index(granularidade):]
+    for usada in opcoes:
+        dados = carregar(usada)
+        if frames.period_span(dados["periodo"]) <= MAX_PONTOS:
+            break
+
+    if usada != granularidade:
+        st.caption(
+            f"Agrupado por {frames.ROTULOS_PERIODO[usada].lower()} para exibir no"
+            f" máximo {MAX_PONTOS} períodos.",
+        )
+    return dados, usada
+
+
+def _filtros_equipe(
+    procuradoria: Procuradoria,
+) -> tuple[tuple[str, ...], datetime.date, datetime.date] | None:
+    """Return the names and date range selected in the filters of the panel."""
+    hoje = datetime.date.today()
+    # Os filtros ficam no corpo do painel: um fragmento não escreve na barra
+    # lateral
+    datas, nomes = st.columns(2)
+    intervalo = datas.date_input(
+        "Selecione o intervalo de datas:",
+        [procuradoria.data_inicial or hoje.replace(month=1, day=1), hoje],
+    )
+    selected_names = nomes.multiselect(
+        "Selecione o(s) nome(s):",
+        options=procuradoria.nomes,
+        default=procuradoria.nomes,
+    )
+
+    # O intervalo fica incompleto enquanto a data final não é escolhida
+    if len(intervalo) != 2:
+        st.info("Selecione a data final do intervalo.")
+        return None
+    start_date, end_date = intervalo
+
+    # Sem nomes selecionados, considerar toda a equipe
+    filtro_nomes = (
+        tuple(n for n in procuradoria.nomes if n in selected_names)
+        or procuradoria.nomes
+    )
+    return filtro_nomes, start_date, end_date
+
+
+def _detalhamento(
+    procuradoria: Procuradoria,
+    periodos: pd.Series,
+    granularidade: str,
+    filtros: tuple[tuple[str, ...], datetime.date, datetime.date] | tuple[()],
+) -> None:
+    """List the publications of one period (and name), a page at a time.
+
+    Only the part of the period within the date filter is listed, the same
+    rows its bar counts. Pages are read from the database with
+    :func:`db.load_publications`; the session keeps the key of the last row
+    of each page seen so far.
+    """
+    nomes, start, end = filtros or ((), None, None)
+    st.subheader("Publicações do Período")
+    rotulos = dict(zip(
+        frames.period_label(periodos, granularidade), periodos, strict=True,
+    ))
+    seletor_periodo, seletor_nome = st.columns(2)
+    # Começar pelo período mais recente; a escolha anterior (ou a barra
+    # clicada) pode ter ficado fora dos filtros atuais
+    if st.session_state.get("detalhe:periodo") not in rotulos:
+        st.session_state["detalhe:periodo"] = list(rotulos)[-1]
+    rotulo = seletor_periodo.selectbox(
+        f"{frames.ROTULOS_PERIODO[granularidade]}:",
+        options=list(rotulos),
+        key="detalhe:periodo",
+    )
+    nome = None
+    if nomes:
+        if st.session_state.get("detalhe:nome") not in ("Todos", *nomes):
+            st.session_state["detalhe:nome"] = "Todos"
+        nome = seletor_nome.selectbox(
+            "Nome:", options=("Todos", *nomes), key="detalhe:nome",
+        )
+        nome = None if nome == "Todos" else nome
+
+    # Voltar à primeira página quando a consulta muda
+    consulta = (procuradoria.filtro, granularidade, rotulo, nome, start, end)
+    if st.session_state.get("detalhe:consulta") != consulta:
+        st.session_state["detalhe:consulta"] = consulta
+        st.session_state["detalhe:cursores"] = []
+    cursores = st.session_state["detalhe:cursores"]
+
+    chave = int(rotulos[rotulo])
+    inicio = frames.period_start(chave, granularidade)
+    fim = frames.period_start(chave + 1, granularidade)
+    # O primeiro e o último período podem ter só parte dentro do filtro
+    if start is not None:
+        inicio = max(inicio, pd.Timestamp(start))
+        fim = min(fim, pd.Timestamp(end) + pd.Timedelta(days=1))
+    with profiling.stage("dados:detalhe") as etapa:
+        try:
+            pagina = db.load_publications(
+                procuradoria.filtro,
+                (nome,) if nome else nomes,
+                inicio.to_pydatetime(),
+                fim.to_pydatetime(),
+                after=cursores[-1] if cursores else None,
+                # Uma linha a mais indica se existe a próxima página
+                limit=LINHAS_DETALHE + 1,
+            )
+        except pymysql.MySQLError as e:
+            # Os gráficos acima continuam valendo sem a listagem
+            st.warning(f"Não foi possível carregar as publicações do período: {e}")
+            return
+        etapa.linhas = len(pagina)
+    tem_proxima = len(pagina) > LINHAS_DETALHE
+    pagina = pagina.iloc[:LINHAS_DETALHE]
+
+    st.dataframe(pagina, hide_index=True, use_container_width=True)
+    anterior, proxima, posicao = st.columns([1, 1, 4])
+    anterior.button(
+        "Anterior",
+        key="detalhe:anterior",
+        on_click=cursores.pop,
+        disabled=not cursores,
+    )
+    proxima.button(
+        "Próxima",
+        key="detalhe:proxima",
+        on_click=cursores.append,
+        args=(db.page_cursor(pagina.iloc[-1]) if tem_proxima else None,),
+        disabled=not tem_proxima,
+    )
+    posicao.caption(f"Página {len(cursores) + 1}")
+
+
+def _aviso_dados(atual: Snapshot[cubo.Indice]) -> None:
+    """Warn that the data shown is older when the last reload failed."""
+    if db.refresh_failed():
+        st.warning(
+            "Não foi possível atualizar os dados. Exibindo os dados de"
+            f" {atual.loaded_on:%d/%m/%Y %H:%M}.",
+        )
+
+
+def _exportar(
+    procuradoria: Procuradoria,
+    filtros: tuple[tuple[str, ...], datetime.date, datetime.date] | tuple[()],
+) -> None:
+    """Render the download of the publications under the filters.
+
+    The file is only generated when the button is clicked, outside the
+    script run, by :func:`exportacao.export`.
+    """
+    with st.expander("Exportar Publicações"):
+        formato = st.radio(
+            "Formato:",
+            options=list(exportacao.FORMATOS),
+            format_func=str.upper,
+            horizontal=True,
+        )
+        st.download_button(
+            "Baixar",
+            data=functools.partial(
+                exportacao.export, formato, procuradoria.filtro, *filtros,
+            ),
+            file_name=f"publicacoes-{procuradoria.slug}.{formato}",
+            mime=exportacao.FORMATOS[formato],
+            on_click="ignore",
+        )
+
+
+@st.fragment
+def _painel(
+    procuradoria: Procuradoria,
+    granularidade: str,
+    atual: Snapshot[cubo.Indice],
+) -> None:
+    """Render the filters, charts and listing of a procuradoria page.
+
+    As a fragment, changing a filter or paging a table reruns only this
+    function: the counts come from the ``atual`` daily cube already loaded
+    by :func:`render`, without going back to the database or the data cache.
+    """
+    # Só o painel roda de novo quando os filtros mudam, sem passar pelo
+    # início do script, onde a medição de cada execução começa
+    with profiling.fragment_run(procuradoria.rotulo):
+        with profiling.stage("filtros") as etapa:
+            if procuradoria.nomes:
+                filtros = _filtros_equipe(procuradoria)
+                if filtros is None:
+                    return
+                # Contar as publicações filtradas por período e nome
+                carregar = functools.partial(
+                    cubo.counts_by_name, atual.value, procuradoria.filtro, *filtros,
+                )
+            else:
+                filtros = ()
+                carregar = functools.partial(
+                    db.load_counts, procuradoria.filtro, snapshot=atual,
+                )
+            dados, granularidade = _carregar_periodos(carregar, granularidade)
+            etapa.linhas = len(dados)
+
+        # Mesmos dados e filtros, mesmos gráficos; a versão é a do cubo exibido,
+        # que pode ser anterior à atual enquanto o novo carrega
+        versao = db.data_version(procuradoria.filtro, atual.key)
+        chave = (procuradoria.filtro, *filtros, versao)
+
+        # Totais, rótulos e séries de todos os gráficos numa agregação só
+        with profiling.stage("agregacao"):
+            resumo = cubo.summarize(dados, granularidade)
+        st.metric(label="Quantidade Total", value=resumo.total)
+        _exportar(procuradoria, filtros)
+        if resumo.por_periodo.empty:
+            return
+
+        for linha in procuradoria.graficos:
+            for coluna, grafico in zip(st.columns(len(linha)), linha):
+                with coluna:
+                    GRAFICOS[grafico](resumo, granularidade, chave)
+
+        _detalhamento(procuradoria, resumo.chaves, granularidade, filtros)
+
+
+def render(procuradoria: Procuradoria) -> None:
+    """Render the page of a procuradoria."""
+    st.title(procuradoria.titulo)
+    try:
+        if not db.has_credentials():
+            st.error("Faltam informações de conexão com o banco de dados.")
+            return
+
+        db.refresh_button(procuradoria.filtro)
+        granularidade = _seletor_granularidade()
+
+        # Só a carga do cubo pode ir ao banco; ela fica fora do painel, que
+        # é o único trecho executado de novo quando os filtros mudam
+        with profiling.stage("dados") as etapa:
+            atual = db.daily_counts()
+            etapa.linhas = len(atual.value.dados)
+        _aviso_dados(atual)
+        # Depois da carga, que já abriu o pool que a sonda usa
+        db.check_changes()
+
+        _painel(procuradoria, granularidade, atual)
+
+    except pymysql.MySQLError as e:
+        st.error(f"Erro na conexão com o banco de dados: {e}")
+
+
+def visao_geral_periodos(todas: pd.DataFrame, granularidade: str) -> pd.DataFrame:
+    """Label the counts of all procuradorias for the overview chart."""
+    rotulos = {p.filtro: p.rotulo for p in PROCURADORIAS}
+
+    # Descartar as publicações sem data e de procuradorias fora do cadastro
+    periodos = todas[
+        todas["nome_procuradoria"].isin(list(rotulos)) & todas["periodo"].notna()
+    ]
+    return pd.DataFrame({
+        frames.ROTULOS_PERIODO[granularidade]: frames.period_label(
+            periodos["periodo"], granularidade,
+        ),
+        "Procuradoria": periodos["nome_procuradoria"].map(rotulos).astype(str),
+        "Quantidade": periodos["quantidade"],
+    })
+
+
+def render_visao_geral(detalhes: dict[str, st.Page]) -> None:
+    """Render the totals and series of every procuradoria.
+
+    Everything comes from the single cached cube behind
+    :func:`db.load_counts_all`; ``detalhes`` maps each filter value to the
+    page it links to.
+    """
+    st.title("Estatística - Visão Geral das Procuradorias :bar_chart:")
+    try:
+        if not db.has_credentials():
+            st.error("Faltam informações de conexão com o banco de dados.")
+            return
+
+        if st.sidebar.button("Atualizar dados"):
+            db.invalidate()
+        granularidade = _seletor_granularidade()
+
+        filtros = [p.filtro for p in PROCURADORIAS]
+
+        with profiling.stage("dados") as etapa:
+            atual = db.daily_counts()
+
+            def carregar(granularidade: str) -> pd.DataFrame:
+                todas = db.load_counts_all(granularidade, atual)
+                return todas[todas["nome_procuradoria"].isin(filtros)]
+
+            todas, granularidade = _carregar_periodos(carregar, granularidade)
+            etapa.linhas = len(todas)
+        _aviso_dados(atual)
+        db.check_changes()
+        with profiling.stage("agregacao"):
+            totais = todas.groupby("nome_procuradoria", observed=True)[
+                "quantidade"
+            ].sum()
+            periodos = visao_geral_periodos(todas, granularidade)
+
+        # Total de cada procuradoria, com acesso à página de detalhes
+        por_linha = 4
+        for inicio in range(0, len(PROCURADORIAS), por_linha):
+            linha = PROCURADORIAS[inicio:inicio + por_linha]
+            for coluna, procuradoria in zip(st.columns(por_linha), linha):
+                with coluna:
+                    st.metric(
+                        label=procuradoria.rotulo,
+                        value=int(totais.get(procuradoria.filtro, 0)),
+                    )
+                    st.page_link(detalhes[procuradoria.filtro], label="Ver detalhes")
+
+        with profiling.stage("figura:visao_geral"):
+            spec = _especificacao(
+                "visao_geral", granularidade, atual.key, periodos,
+            )
+        with profiling.stage("exibicao:visao_geral"):
+            st.plotly_chart(spec, use_container_width=True)
+
+    except pymysql.MySQLError as e:
+        st.error(f"Erro na conexão com o banco de dados: {e}")
+
+
+def page(procuradoria: Procuradoria) -> st.Page:
+    """Return the navigation entry of a procuradoria."""
+    return st.Page(
+        functools.partial(render, procuradoria),
+        title=procuradoria.rotulo,
+        url_path=procuradoria.slug,
+    )
+
+
+def navigation() -> dict[str, list[st.Page]]:
+    """Return the dashboard pages, grouped in navigation sections."""
+    detalhes = {p.filtro: page(p) for p in PROCURADORIAS}
+    visao_geral = st.Page(
+        functools.partial(render_visao_geral, detalhes),
+        title="Visão Geral",
+        url_path="visao-geral",
+        default=True,
+    )
+    return {"": [visao_geral], "Procuradorias": list(detalhes.values())}
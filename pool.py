@@ -0,0 +1,121 @@
+"""Pool de conexões com o banco de dados."""
+
+import contextlib
+import threading
+import time
+from collections.abc import Callable, Iterator
+
+import pymysql
+
+
+class PoolTimeoutError(pymysql.err.OperationalError):
+    """No connection became available within the checkout timeout."""
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of pymysql connections.
+
+    At most ``size`` connections are checked out at once; a checkout waits
+    up to ``timeout`` seconds for a free slot. Idle connections are pinged
+    (reconnecting if needed) before being handed out, and the ones unused
+    for more than ``max_idle`` seconds are closed.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], pymysql.connections.Connection],
+        size: int = 5,
+        timeout: float = 10.0,
+        max_idle: float = 300.0,
+    ) -> None:
+        """Create an empty pool; connections are opened on demand."""
+        self._factory = factory
+        self._timeout = timeout
+        self._max_idle = max_idle
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        # Conexões livres e o instante em que foram devolvidas
+        self._idle: list[tuple[pymysql.connections.Connection, float]] = []
+
+    @contextlib.contextmanager
+    def connection(self) -> Iterator[pymysql.connections.Connection]:
+        """Check out a connection for the duration of the ``with`` block.
+
+        A connection that raised inside the block is closed instead of
+        being returned to the pool.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException:
+            self.release(conn, discard=True)
+            raise
+        self.release(conn)
+
+    def acquire(self) -> pymysql.connections.Connection:
+        """Take a healthy connection from the pool, opening one if needed."""
+        if not self._slots.acquire(timeout=self._timeout):
+            msg = f"Nenhuma conexão livre após {self._timeout:g}s."
+            raise PoolTimeoutError(msg)
+        try:
+            return self._take_idle() or self._factory()
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(
+        self,
+        conn: pymysql.connections.Connection,
+        *,
+        discard: bool = False,
+    ) -> None:
+        """Return a connection to the pool, or close it if ``discard``."""
+        try:
+            if discard or not conn.open:
+                _close_quietly(conn)
+            else:
+                with self._lock:
+                    self._idle.append((conn, time.monotonic()))
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            _close_quietly(conn)
+
+    def _take_idle(self) -> pymysql.connections.Connection | None:
+        """Pop the most recently used live connection, evicting stale ones."""
+        while True:
+            with self._lock:
+                stale = self._pop_stale()
+                conn = self._idle.pop()[0] if self._idle else None
+            for old in stale:
+                _close_quietly(old)
+            if conn is None:
+                return None
+            try:
+                conn.ping(reconnect=True)
+            except pymysql.MySQLError:
+                _close_quietly(conn)
+                continue
+            return conn
+
+    def _pop_stale(self) -> list[pymysql.connections.Connection]:
+        """Remove connections idle for over ``max_idle`` (needs the lock)."""
+        limite = time.monotonic() - self._max_idle
+        # A lista está em ordem de devolução: as mais antigas vêm primeiro
+        corte = 0
+        while corte < len(self._idle) and self._idle[corte][1] < limite:
+            corte += 1
+        stale = [conn for conn, _ in self._idle[:corte]]
+        del self._idle[:corte]
+        return stale
+
+
+def _close_quietly(conn: pymysql.connections.Connection) -> None:
+    """Close ``conn`` ignoring errors from an already broken connection."""
+    with contextlib.suppress(Exception):
+        conn.close()
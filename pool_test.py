@@ -0,0 +1,81 @@
+"""Testes do pool de conexões."""
+
+import threading
+import unittest
+
+import pymysql
+
+from pool import ConnectionPool, PoolTimeoutError
+
+
+class Conexao:
+    """Stand-in for a pymysql connection."""
+
+    def __init__(self) -> None:
+        self.open = True
+        self.quebrada = False
+
+    def ping(self, reconnect: bool = True) -> None:  # noqa: ARG002
+        if self.quebrada:
+            raise pymysql.err.OperationalError(2006, "MySQL server has gone away")
+
+    def close(self) -> None:
+        self.open = False
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.abertas: list[Conexao] = []
+        self.pool = ConnectionPool(self.abrir, size=2, timeout=0.05)
+
+    def abrir(self) -> Conexao:
+        conexao = Conexao()
+        self.abertas.append(conexao)
+        return conexao
+
+    def test_connections_are_reused(self) -> None:
+        with self.pool.connection() as primeira:
+            pass
+        with self.pool.connection() as segunda:
+            pass
+        self.assertIs(primeira, segunda)
+        self.assertEqual(len(self.abertas), 1)
+
+    def test_checkout_times_out_when_full(self) -> None:
+        self.pool.acquire()
+        self.pool.acquire()
+        with self.assertRaises(PoolTimeoutError):
+            self.pool.acquire()
+
+    def test_release_frees_a_slot_for_a_waiting_checkout(self) -> None:
+        self.pool = ConnectionPool(self.abrir, size=1, timeout=5)
+        conexao = self.pool.acquire()
+        threading.Timer(0.01, self.pool.release, args=(conexao,)).start()
+        self.assertIs(self.pool.acquire(), conexao)
+
+    def test_connection_that_raised_is_closed(self) -> None:
+        with self.assertRaises(ValueError), self.pool.connection() as conexao:
+            raise ValueError
+        self.assertFalse(conexao.open)
+        with self.pool.connection() as outra:
+            self.assertIsNot(outra, conexao)
+
+    def test_broken_idle_connection_is_replaced(self) -> None:
+        with self.pool.connection() as conexao:
+            pass
+        conexao.quebrada = True
+        with self.pool.connection() as outra:
+            self.assertIsNot(outra, conexao)
+        self.assertFalse(conexao.open)
+
+    def test_stale_idle_connections_are_closed(self) -> None:
+        self.pool = ConnectionPool(self.abrir, size=2, max_idle=0)
+        with self.pool.connection() as conexao:
+            pass
+        with self.pool.connection() as outra:
+            self.assertIsNot(outra, conexao)
+        self.assertFalse(conexao.open)
+
+
+if __name__ == "__main__":
+    unittest.main()
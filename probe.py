@@ -0,0 +1,102 @@
+"""Detecção barata de mudanças na tabela ANDAMENTOS."""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+import pandas as pd
+
+logger = logging.getLogger("dashboard.sonda")
+
+# Uma linha por procuradoria: maior id, quantidade e publicação mais recente
+PROBE_QUERY = (
+    "SELECT nome_procuradoria, MAX(id) AS id, COUNT(*) AS quantidade,"
+    " MAX(datapub) AS datapub FROM ANDAMENTOS GROUP BY nome_procuradoria"
+)
+
+
+class ChangeProbe:
+    """Tell which procuradorias changed since the last check.
+
+    Each check runs :data:`PROBE_QUERY`, one small aggregate over the
+    ``nome_procuradoria`` index, and compares the fingerprint of every
+    procuradoria (``MAX(id)``, ``COUNT(*)``, ``MAX(datapub)``) with the
+    previous one. Inserts and deletes always change it; edits to other
+    columns of existing rows go unnoticed until the data is refreshed.
+
+    Pages call :meth:`start`, which runs the check in a daemon thread, so
+    no page waits for the aggregate over the whole table.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], pd.DataFrame],
+        interval: float,
+    ) -> None:
+        """Use ``fetch(query)``, at most once every ``interval`` seconds."""
+        self._fetch = fetch
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._checked = float("-inf")
+        self._fingerprints: dict[str, tuple] | None = None
+        self._thread: threading.Thread | None = None
+
+    def check(self) -> list[str]:
+        """Return the procuradorias changed since the last check.
+
+        Returns nothing while the interval has not passed or while another
+        session is already checking, so concurrent runs query only once.
+        The first check just records the current fingerprints.
+        """
+        if time.monotonic() - self._checked < self._interval:
+            return []
+        if not self._lock.acquire(blocking=False):
+            return []
+        try:
+            if time.monotonic() - self._checked < self._interval:
+                return []
+            # Uma verificação que falhou também espera o intervalo
+            self._checked = time.monotonic()
+            atuais = {
+                str(procuradoria): (id_, quantidade, datapub)
+                for procuradoria, id_, quantidade, datapub in self._fetch(
+                    PROBE_QUERY,
+                ).itertuples(index=False)
+            }
+            anteriores, self._fingerprints = self._fingerprints, atuais
+        finally:
+            self._lock.release()
+
+        if anteriores is None:
+            return []
+        return sorted(
+            procuradoria
+            for procuradoria in anteriores.keys() | atuais.keys()
+            if anteriores.get(procuradoria) != atuais.get(procuradoria)
+        )
+
+    def start(self, on_change: Callable[[list[str]], None]) -> None:
+        """Check in the background, then call ``on_change(changed)``.
+
+        Does nothing while the interval has not passed or while a check is
+        still running. A failed check is logged and retried after the
+        interval.
+        """
+        if time.monotonic() - self._checked < self._interval:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._run, args=(on_change,), name="sonda", daemon=True,
+        )
+        self._thread.start()
+
+    def _run(self, on_change: Callable[[list[str]], None]) -> None:
+        try:
+            mudadas = self.check()
+        except Exception:
+            logger.exception("Falha ao verificar mudanças no banco")
+            return
+        if mudadas:
+            on_change(mudadas)
@@ -0,0 +1,82 @@
+"""Testes da sonda de mudanças."""
+
+import threading
+import unittest
+
+import pandas as pd
+
+from probe import ChangeProbe
+
+
+class Banco:
+    """Stand-in for the database, answering the probe query."""
+
+    def __init__(self) -> None:
+        self.linhas = {"PFT": (10, 10, "2024-01-10"), "PPUI": (7, 7, "2024-01-07")}
+        self.falhar = False
+        self.consultas = 0
+
+    def __call__(self, query: str) -> pd.DataFrame:  # noqa: ARG002
+        self.consultas += 1
+        if self.falhar:
+            raise ValueError
+        return pd.DataFrame(
+            [(nome, *linha) for nome, linha in self.linhas.items()],
+            columns=["nome_procuradoria", "id", "quantidade", "datapub"],
+        )
+
+
+class ChangeProbeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.banco = Banco()
+        self.sonda = ChangeProbe(self.banco, interval=0)
+
+    def test_first_check_only_records(self) -> None:
+        self.assertEqual(self.sonda.check(), [])
+        self.assertEqual(self.sonda.check(), [])
+
+    def test_changed_added_and_removed_procuradorias(self) -> None:
+        self.sonda.check()
+        self.banco.linhas["PFT"] = (11, 11, "2024-01-11")
+        self.banco.linhas["PLC"] = (12, 1, "2024-01-12")
+        del self.banco.linhas["PPUI"]
+        self.assertEqual(self.sonda.check(), ["PFT", "PLC", "PPUI"])
+        self.assertEqual(self.sonda.check(), [])
+
+    def test_deleted_row_is_a_change(self) -> None:
+        self.sonda.check()
+        self.banco.linhas["PFT"] = (10, 9, "2024-01-10")
+        self.assertEqual(self.sonda.check(), ["PFT"])
+
+    def test_interval_between_checks(self) -> None:
+        self.sonda = ChangeProbe(self.banco, interval=3600)
+        self.sonda.check()
+        self.banco.linhas["PFT"] = (11, 11, "2024-01-11")
+        self.assertEqual(self.sonda.check(), [])
+        self.assertEqual(self.banco.consultas, 1)
+
+    def test_start_checks_in_the_background(self) -> None:
+        self.sonda.check()
+        self.banco.linhas["PFT"] = (11, 11, "2024-01-11")
+        avisadas = []
+        avisou = threading.Event()
+
+        def avisar(mudadas: list[str]) -> None:
+            avisadas.extend(mudadas)
+            avisou.set()
+
+        self.sonda.start(avisar)
+        self.assertTrue(avisou.wait(5))
+        self.assertEqual(avisadas, ["PFT"])
+
+    def test_failed_background_check_is_logged(self) -> None:
+        self.banco.falhar = True
+        avisadas = []
+        with self.assertLogs("dashboard.sonda"):
+            self.sonda.start(avisadas.extend)
+            self.sonda._thread.join(5)  # noqa: SLF001
+        self.assertEqual(avisadas, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
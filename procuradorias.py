@@ -0,0 +1,95 @@
+"""Cadastro das procuradorias exibidas no dashboard."""
+
+import datetime
+from dataclasses import dataclass
+
+# Conjuntos de gráficos: cada linha é exibida lado a lado em colunas
+GRAFICOS_RESUMO = (("barras_mensais", "tabela_mensal"),)
+GRAFICOS_EQUIPE = (
+    ("pizza_por_nome", "barras_mensais_echarts"),
+    ("barras_mensais_por_nome",),
+    ("tabela_mensal_por_nome",),
+)
+
+
+@dataclass(frozen=True)
+class Procuradoria:
+    """One dashboard page: what to query and how to show it."""
+
+    slug: str
+    rotulo: str
+    titulo: str
+    filtro: str
+    nomes: tuple[str, ...] = ()
+    graficos: tuple[tuple[str, ...], ...] = GRAFICOS_RESUMO
+    data_inicial: datetime.date | None = None
+
+
+PROCURADORIAS = (
+    Procuradoria(
+        slug="gapr",
+        rotulo="GAPR",
+        titulo="Estatística - grupo apoio processos relevantes - GAPR - 2024 :bar_chart:",
+        filtro="GAPR",
+    ),
+    Procuradoria(
+        slug="pft",
+        rotulo="PFT",
+        titulo="Estatística da procuradoria Fiscal e Tributária - PFT - 2024 :bar_chart:",
+        filtro="PFT",
+    ),
+    Procuradoria(
+        slug="plc",
+        rotulo="PLC",
+        titulo="Estatística da procuradoria Licitações e Contratos - PLC - 2024 :bar_chart:",
+        filtro="PLC",
+    ),
+    Procuradoria(
+        slug="procon",
+        rotulo="PROCON",
+        titulo="Estatística - PROCON :bar_chart:",
+        filtro="PROCON",
+    ),
+    Procuradoria(
+        slug="tc",
+        rotulo="TC",
+        titulo="Estatística - Tribunal de Contas - TC - 2024 :bar_chart:",
+        filtro="TC",
+    ),
+    Procuradoria(
+        slug="secadjunta",
+        rotulo="Secretaria Adjunta",
+        titulo="Estatística - Secretaria Adjunta - André Salles :bar_chart:",
+        filtro="S. ADJUNTO",
+    ),
+    Procuradoria(
+        slug="pcidade",
+        rotulo="PCIDADE",
+        titulo="ESTATÍSTICA - PROCURADORIA DA CIDADE - PCIDADE - PUBLICAÇÕES (DIÁRIOS E PORTAIS) - 2024 :bar_chart:",
+        filtro="PCIDADE",
+        nomes=(
+            "Fabiana de Araujo Prado",
+            "Ariovaldo Alves Vidal",
+            "Melissa Cristina Arrepia Sampaio de Melo",
+            "Douglas Sales Leite",
+            "André Salles Barboza",
+        ),
+        graficos=GRAFICOS_EQUIPE,
+        data_inicial=datetime.date(2024, 5, 15),
+    ),
+    Procuradoria(
+        slug="ppui",
+        rotulo="PPUI",
+        titulo="ESTATÍSTICA DA PROCURADORIA DE PATRIMONIO URBANÍSTICO E IMOBILIÁRIO - PPUI - PUBLICAÇÕES - 2024  :bar_chart:",
+        filtro="PPUI",
+        nomes=(
+            "Luís Fernando da Costa",
+            "Glaucus Cerqueira Barreto",
+            "Gabriela Abramides",
+            "Jean Almeida do Vale",
+            "João Paulo Gregório Canelas",
+        ),
+        graficos=GRAFICOS_EQUIPE,
+        data_inicial=datetime.date(2024, 5, 15),
+    ),
+)
@@ -0,0 +1,168 @@
+"""Medição do tempo de cada etapa das páginas."""
+
+import contextlib
+import contextvars
+import json
+import logging
+import os
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+
+import pandas as pd
+import streamlit as st
+
+# Uma linha JSON por execução medida, na saída de erro do servidor
+logger = logging.getLogger("dashboard.perfil")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# Liga a medição para todas as sessões; sem isso, só com ?perfil=1 na URL
+ENABLED = os.getenv("DASHBOARD_PROFILE") == "1"
+
+
+@dataclass
+class Etapa:
+    """Time, rows and bytes measured for one run of a stage."""
+
+    nome: str
+    segundos: float = 0.0
+    linhas: int | None = None
+    bytes: int | None = None
+
+    def medir_bytes(self, frame: pd.DataFrame) -> None:
+        """Add the in-memory size of ``frame`` to the stage bytes."""
+        self.bytes = (self.bytes or 0) + int(frame.memory_usage(deep=True).sum())
+
+
+class _EtapaNula:
+    """Stand-in stage used while profiling is off; ignores everything."""
+
+    linhas = None
+    bytes = None
+
+    def __setattr__(self, nome: str, valor: object) -> None:
+        pass
+
+    def medir_bytes(self, frame: pd.DataFrame) -> None:
+        pass
+
+
+_NULA = _EtapaNula()
+
+# Páginas que já rodaram neste processo; a primeira execução de cada uma
+# inclui as importações feitas sob demanda
+_executadas: set[str] = set()
+_coletor: contextvars.ContextVar[list[Etapa] | None] = contextvars.ContextVar(
+    "coletor", default=None,
+)
+
+
+def start_run() -> None:
+    """Start collecting the stages of this script run, if profiling is on."""
+    ligado = ENABLED or st.query_params.get("perfil") == "1"
+    _coletor.set([] if ligado else None)
+
+
+@contextlib.contextmanager
+def _medir(nome: str, coletor: list[Etapa]) -> Iterator[Etapa]:
+    etapa = Etapa(nome)
+    inicio = time.perf_counter()
+    try:
+        yield etapa
+    finally:
+        etapa.segundos = time.perf_counter() - inicio
+        coletor.append(etapa)
+
+
+def stage(nome: str) -> contextlib.AbstractContextManager[Etapa]:
+    """Time the ``with`` block as stage ``nome`` of the current run.
+
+    The context value lets the block report ``linhas`` and ``bytes``.
+    While profiling is off this returns a shared no-op context.
+    """
+    coletor = _coletor.get()
+    if coletor is None:
+        return contextlib.nullcontext(_NULA)
+    return _medir(nome, coletor)
+
+
+@contextlib.contextmanager
+def fragment_run(pagina: str) -> Iterator[None]:
+    """Profile the ``with`` block as a rerun of just a fragment of ``pagina``.
+
+    Such reruns skip the top of the script, where :func:`start_run` is
+    called, so the block starts and finishes its own collection. Within a
+    full run, the stages go to the run's collection as usual.
+    """
+    if _coletor.get() is not None:
+        yield
+        return
+    start_run()
+    try:
+        yield
+    finally:
+        finish_run(pagina, fragmento=True)
+
+
+def finish_run(
+    pagina: str,
+    cargas: Callable[[], pd.DataFrame] | None = None,
+    *,
+    fragmento: bool = False,
+) -> None:
+    """Log the stages of this run and show them in the sidebar panel.
+
+    The first run of each page in the process is flagged as ``primeira``:
+    its time includes the cold start (module imports and empty caches).
+    ``cargas``, if given, returns the process-wide counters of the database
+    loads, shown below the stages. Reruns of a ``fragmento`` are logged as
+    such and shown at the end of the fragment, which cannot write to the
+    sidebar.
+    """
+    primeira = not fragmento and pagina not in _executadas
+    if not fragmento:
+        _executadas.add(pagina)
+    coletor = _coletor.get()
+    if coletor is None:
+        return
+    _coletor.set(None)
+
+    logger.info(json.dumps({
+        "pagina": pagina,
+        "primeira": primeira,
+        "fragmento": fragmento,
+        "etapas": [vars(etapa) for etapa in coletor],
+    }, ensure_ascii=False))
+
+    resumo = (
+        pd.DataFrame(
+            [vars(etapa) for etapa in coletor],
+            columns=["nome", "segundos", "linhas", "bytes"],
+        )
+        .astype({"linhas": "Int64", "bytes": "Int64"})
+        .groupby("nome", sort=False)
+        .agg(
+            vezes=("segundos", "size"),
+            segundos=("segundos", "sum"),
+            linhas=("linhas", lambda serie: serie.sum(min_count=1)),
+            bytes=("bytes", lambda serie: serie.sum(min_count=1)),
+        )
+    )
+    painel = st.expander if fragmento else st.sidebar.expander
+    with painel("Perfil de desempenho"):
+        if primeira:
+            st.caption("Primeira execução da página neste processo.")
+        st.dataframe(resumo, column_config={
+            "segundos": st.column_config.NumberColumn(format="%.4f"),
+        })
+        if cargas is not None:
+            st.caption("Consultas ao banco neste processo")
+            st.dataframe(cargas(), column_config={
+                "segundos": st.column_config.NumberColumn(format="%.4f"),
+                "espera": st.column_config.NumberColumn(format="%.4f"),
+            })
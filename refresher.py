@@ -0,0 +1,132 @@
+"""Atualização em segundo plano de dados caros de carregar."""
+
+import datetime
+import logging
+import threading
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+V = TypeVar("V")
+
+logger = logging.getLogger("dashboard.atualizacao")
+
+
+@dataclass(frozen=True)
+class Snapshot(Generic[V]):
+    """A loaded value, the key it was loaded for and when it was loaded."""
+
+    key: Hashable
+    value: V
+    loaded_at: float
+    loaded_on: datetime.datetime
+
+
+class Refresher(Generic[V]):
+    """Serve the last loaded value while a newer one is loaded in the background.
+
+    :meth:`get` returns at once whenever some value was already loaded. If
+    it was loaded for another key (a newer data version) or is older than
+    ``max_age`` seconds, a single daemon thread runs ``load()`` and swaps
+    the new snapshot in when it is complete, so readers see either the old
+    value or the new one, never a partial load. A failed load keeps the
+    old value, sets :attr:`failed` and is retried after ``retry`` seconds.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], V],
+        max_age: float,
+        retry: float = 30,
+        update: Callable[[Snapshot[V], Hashable], V] | None = None,
+    ) -> None:
+        """Use ``load()`` to build the value.
+
+        Once a value exists, ``update(snapshot, key)`` builds the next one
+        from the current snapshot instead, if given; it can reload only
+        what differs between ``snapshot.key`` and ``key``.
+        """
+        self._load = load
+        self._update = update
+        self._max_age = max_age
+        self._retry = retry
+        self._lock = threading.Lock()
+        self._snapshot: Snapshot[V] | None = None
+        self._thread: threading.Thread | None = None
+        self._failed_at = float("-inf")
+        self._expired = False
+        # Muda a cada expiração, para uma carga antiga não voltar depois dela
+        self._generation = 0
+
+    @property
+    def failed(self) -> bool:
+        """Return whether the last load failed and an older value is served."""
+        return self._failed_at > float("-inf")
+
+    def get(self, key: Hashable) -> Snapshot[V]:
+        """Return the current snapshot, refreshing it if out of date.
+
+        Only the first call (or the first after :meth:`expire`) waits for
+        ``load()``; later ones may get a snapshot of an older ``key``. If
+        that wait fails, the previous snapshot is returned when there is
+        one, and no call waits again until ``retry`` seconds have passed.
+        """
+        snapshot = self._snapshot
+        agora = time.monotonic()
+        if snapshot is None or self._expired:
+            if snapshot is not None and agora - self._failed_at <= self._retry:
+                return snapshot
+            try:
+                return self._swap(key, self._generation)
+            except Exception:
+                if snapshot is None:
+                    raise
+                self._failed_at = time.monotonic()
+                logger.exception("Falha ao recarregar os dados")
+                return snapshot
+
+        if snapshot.key != key or agora - snapshot.loaded_at > self._max_age:
+            with self._lock:
+                livre = self._thread is None or not self._thread.is_alive()
+                if livre and agora - self._failed_at > self._retry:
+                    self._thread = threading.Thread(
+                        target=self._refresh,
+                        args=(key, self._generation),
+                        name="atualizacao",
+                        daemon=True,
+                    )
+                    self._thread.start()
+        return snapshot
+
+    def expire(self) -> None:
+        """Make the next :meth:`get` wait for a new value.
+
+        The current value is kept, and still served if that load fails.
+        """
+        with self._lock:
+            self._generation += 1
+            self._expired = True
+            self._failed_at = float("-inf")
+
+    def _swap(self, key: Hashable, generation: int) -> Snapshot[V]:
+        anterior = self._snapshot
+        if anterior is None or self._update is None:
+            valor = self._load()
+        else:
+            valor = self._update(anterior, key)
+        snapshot = Snapshot(key, valor, time.monotonic(), datetime.datetime.now())
+        with self._lock:
+            if generation == self._generation:
+                # Uma única atribuição: quem lê vê o valor antigo ou o novo
+                self._snapshot = snapshot
+                self._expired = False
+                self._failed_at = float("-inf")
+        return snapshot
+
+    def _refresh(self, key: Hashable, generation: int) -> None:
+        try:
+            self._swap(key, generation)
+        except Exception:
+            self._failed_at = time.monotonic()
+            logger.exception("Falha ao atualizar os dados em segundo plano")
@@ -0,0 +1,107 @@
+"""Testes da atualização em segundo plano."""
+
+import threading
+import unittest
+
+from refresher import Refresher, Snapshot
+
+
+class Carga:
+    """Load that returns 1, 2, 3... and can be held or made to fail."""
+
+    def __init__(self) -> None:
+        self.valor = 0
+        self.falhar = False
+        self.liberada = threading.Event()
+        self.liberada.set()
+
+    def __call__(self) -> int:
+        self.liberada.wait(5)
+        if self.falhar:
+            raise ValueError
+        self.valor += 1
+        return self.valor
+
+
+class RefresherTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.carga = Carga()
+        self.refresher = Refresher(self.carga, max_age=3600, retry=0)
+
+    def esperar_atualizacao(self) -> None:
+        self.refresher._thread.join(5)  # noqa: SLF001
+
+    def test_first_get_loads(self) -> None:
+        snapshot = self.refresher.get("v1")
+        self.assertEqual((snapshot.key, snapshot.value), ("v1", 1))
+        self.assertIs(self.refresher.get("v1"), snapshot)
+
+    def test_new_key_serves_old_value_while_loading(self) -> None:
+        self.refresher.get("v1")
+        self.carga.liberada.clear()
+        self.assertEqual(self.refresher.get("v2").value, 1)
+        self.carga.liberada.set()
+        self.esperar_atualizacao()
+        self.assertEqual(self.refresher.get("v2").value, 2)
+
+    def test_failed_refresh_keeps_old_value(self) -> None:
+        self.refresher.get("v1")
+        self.carga.falhar = True
+        with self.assertLogs("dashboard.atualizacao"):
+            self.refresher.get("v2")
+            self.esperar_atualizacao()
+        self.assertTrue(self.refresher.failed)
+        self.assertEqual(self.refresher.get("v1").value, 1)
+
+        self.carga.falhar = False
+        self.refresher.get("v2")
+        self.esperar_atualizacao()
+        self.assertFalse(self.refresher.failed)
+        self.assertEqual(self.refresher.get("v2").value, 2)
+
+    def test_expire_waits_for_new_value(self) -> None:
+        self.refresher.get("v1")
+        self.refresher.expire()
+        self.assertEqual(self.refresher.get("v1").value, 2)
+
+    def test_expire_falls_back_when_load_fails(self) -> None:
+        self.refresher.get("v1")
+        self.refresher.expire()
+        self.carga.falhar = True
+        with self.assertLogs("dashboard.atualizacao"):
+            self.assertEqual(self.refresher.get("v1").value, 1)
+        self.assertTrue(self.refresher.failed)
+
+    def test_first_load_failure_raises(self) -> None:
+        self.carga.falhar = True
+        with self.assertRaises(ValueError):
+            self.refresher.get("v1")
+
+    def test_update_builds_on_the_current_snapshot(self) -> None:
+        atualizacoes = []
+
+        def atualizar(snapshot: Snapshot[int], key: str) -> int:
+            atualizacoes.append((snapshot.key, key))
+            return snapshot.value * 10
+
+        self.refresher = Refresher(self.carga, max_age=3600, retry=0, update=atualizar)
+        self.refresher.get("v1")
+        self.refresher.get("v2")
+        self.esperar_atualizacao()
+        self.assertEqual(self.refresher.get("v2").value, 10)
+        self.assertEqual(atualizacoes, [("v1", "v2")])
+        self.assertEqual(self.carga.valor, 1)
+
+    def test_refresh_started_before_expire_is_dropped(self) -> None:
+        self.refresher.get("v1")
+        self.carga.liberada.clear()
+        self.refresher.get("v2")
+        self.refresher.expire()
+        self.carga.liberada.set()
+        self.esperar_atualizacao()
+        # A carga antiga terminou, mas não substituiu o valor expirado
+        self.assertEqual(self.refresher.get("v2").value, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""Execução única de cargas idênticas pedidas ao mesmo tempo."""
+
+import threading
+import time
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+import pandas as pd
+import pymysql
+
+V = TypeVar("V")
+
+
+class FlightTimeoutError(pymysql.err.OperationalError):
+    """The load shared with another caller did not finish within the timeout."""
+
+
+@dataclass
+class FlightStats:
+    """Counters of the loads of one name since the process started."""
+
+    cargas: int = 0
+    compartilhadas: int = 0
+    expiradas: int = 0
+    falhas: int = 0
+    segundos: float = 0.0
+    espera: float = 0.0
+
+
+class _Flight(Generic[V]):
+    """A load in progress and, once ``done`` is set, its outcome."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: V | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into a single load.
+
+    The first caller of a key runs the load; callers arriving while it
+    runs wait up to ``timeout`` seconds and get the same value (the very
+    same object, which must not be modified) or the same exception. Once
+    the load finishes, the next call of the key loads again. Counters are
+    kept per ``name``, a label that groups related keys.
+    """
+
+    def __init__(self, timeout: float = 60.0) -> None:
+        """Make waiting callers give up after ``timeout`` seconds."""
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, _Flight] = {}
+        self._stats: dict[str, FlightStats] = {}
+
+    def run(self, name: str, key: Hashable, load: Callable[[], V]) -> V:
+        """Return ``load()``, sharing it with concurrent calls of ``key``."""
+        with self._lock:
+            stats = self._stats.setdefault(name, FlightStats())
+            flight = self._flights.get(key)
+            lider = flight is None
+            if lider:
+                flight = self._flights[key] = _Flight()
+                stats.cargas += 1
+            else:
+                stats.compartilhadas += 1
+
+        inicio = time.perf_counter()
+        if lider:
+            try:
+                flight.value = load()
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                    stats.segundos += time.perf_counter() - inicio
+                    stats.falhas += flight.error is not None
+                flight.done.set()
+            return flight.value
+
+        concluida = flight.done.wait(self._timeout)
+        with self._lock:
+            stats.espera += time.perf_counter() - inicio
+            stats.expiradas += not concluida
+        if not concluida:
+            msg = f"A carga compartilhada não terminou em {self._timeout:g}s."
+            raise FlightTimeoutError(msg)
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def stats(self) -> pd.DataFrame:
+        """Return the counters of every name, one row per name."""
+        with self._lock:
+            linhas = {name: vars(stats).copy() for name, stats in self._stats.items()}
+        return pd.DataFrame.from_dict(
+            linhas, orient="index", columns=list(vars(FlightStats())),
+        )
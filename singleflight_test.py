@@ -0,0 +1,85 @@
+"""Testes da execução única de cargas concorrentes."""
+
+import threading
+import time
+import unittest
+
+from singleflight import FlightTimeoutError, SingleFlight
+
+
+class SingleFlightTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.voo = SingleFlight(timeout=5)
+        self.liberar = threading.Event()
+        self.cargas = 0
+
+    def carga(self) -> object:
+        self.cargas += 1
+        self.liberar.wait(5)
+        return object()
+
+    def concorrentes(self, quantidade: int, carga=None) -> list:
+        """Run ``quantidade`` calls of one key at once; return their results."""
+        resultados = [None] * quantidade
+
+        def chamar(posicao: int) -> None:
+            try:
+                resultados[posicao] = self.voo.run("q", "chave", carga or self.carga)
+            except Exception as e:  # noqa: BLE001
+                resultados[posicao] = e
+
+        threads = [
+            threading.Thread(target=chamar, args=(posicao,))
+            for posicao in range(quantidade)
+        ]
+        for thread in threads:
+            thread.start()
+        # Esperar todas estarem na mesma carga antes de liberá-la
+        while self.voo.stats().loc["q", "compartilhadas"] < quantidade - 1:
+            time.sleep(0.001)
+        self.liberar.set()
+        for thread in threads:
+            thread.join()
+        return resultados
+
+    def test_concurrent_calls_share_one_load(self) -> None:
+        resultados = self.concorrentes(10)
+        self.assertEqual(self.cargas, 1)
+        self.assertTrue(all(valor is resultados[0] for valor in resultados))
+        stats = self.voo.stats().loc["q"]
+        self.assertEqual((stats["cargas"], stats["compartilhadas"]), (1, 9))
+
+    def test_waiting_calls_get_the_error(self) -> None:
+        def falhar() -> object:
+            self.liberar.wait(5)
+            raise ValueError
+
+        resultados = self.concorrentes(3, falhar)
+        self.assertTrue(all(isinstance(erro, ValueError) for erro in resultados))
+        self.assertEqual(self.voo.stats().loc["q", "falhas"], 1)
+
+    def test_next_call_after_a_load_loads_again(self) -> None:
+        self.liberar.set()
+        primeiro = self.voo.run("q", "chave", self.carga)
+        segundo = self.voo.run("q", "chave", self.carga)
+        self.assertIsNot(primeiro, segundo)
+        self.assertEqual(self.cargas, 2)
+
+    def test_wait_times_out(self) -> None:
+        self.voo = SingleFlight(timeout=0.01)
+        lider = threading.Thread(
+            target=self.voo.run, args=("q", "chave", self.carga),
+        )
+        lider.start()
+        while self.voo.stats().empty:
+            time.sleep(0.001)
+        with self.assertRaises(FlightTimeoutError):
+            self.voo.run("q", "chave", self.carga)
+        self.liberar.set()
+        lider.join()
+        self.assertEqual(self.voo.stats().loc["q", "expiradas"], 1)
+        self.assertEqual(self.cargas, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
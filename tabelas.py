@@ -0,0 +1,50 @@
+"""Tabelas paginadas e ordenadas no servidor."""
+
+import pandas as pd
+import streamlit as st
+
+# Opções de linhas por página
+TAMANHOS_PAGINA = (10, 25, 50, 100)
+
+
+def paginada(dados: pd.DataFrame, chave: str) -> None:
+    """Show ``dados`` one page at a time, sorted and sliced on the server.
+
+    Only the visible page is serialized and sent to the browser, however
+    many rows the table has. ``chave`` keeps the widgets of each table on
+    the page apart.
+    """
+    ordenar, ordem, tamanho, numero = st.columns([2, 1, 1, 1])
+    coluna = ordenar.selectbox(
+        "Ordenar por:", options=list(dados.columns), key=f"{chave}:coluna",
+    )
+    decrescente = ordem.selectbox(
+        "Ordem:",
+        options=(False, True),
+        format_func=lambda valor: "Decrescente" if valor else "Crescente",
+        key=f"{chave}:ordem",
+    )
+    linhas = tamanho.selectbox(
+        "Linhas por página:", options=TAMANHOS_PAGINA, key=f"{chave}:tamanho",
+    )
+
+    total = max(1, -(-len(dados) // linhas))
+    # A página escolhida pode não existir mais depois de mudar os filtros
+    if st.session_state.get(f"{chave}:pagina", 1) > total:
+        st.session_state[f"{chave}:pagina"] = total
+    pagina = numero.number_input(
+        f"Página (de {total}):",
+        min_value=1,
+        max_value=total,
+        key=f"{chave}:pagina",
+    )
+
+    inicio = (pagina - 1) * linhas
+    visiveis = dados.sort_values(
+        coluna, ascending=not decrescente, kind="stable",
+    ).iloc[inicio:inicio + linhas]
+    st.dataframe(visiveis, hide_index=True, use_container_width=True)
+    st.caption(
+        f"Linhas {min(inicio + 1, len(dados))} a {inicio + len(visiveis)}"
+        f" de {len(dados)}",
+    )
@@ -0,0 +1,67 @@
+"""Testes da tabela paginada."""
+
+import unittest
+
+from streamlit.testing.v1 import AppTest
+
+
+def _pagina() -> None:
+    """Show a 23-row table, whose size the test sets in session state."""
+    import pandas as pd  # noqa: PLC0415
+    import streamlit as st  # noqa: PLC0415
+
+    import tabelas  # noqa: PLC0415
+
+    linhas = st.session_state.get("linhas", 23)
+    tabelas.paginada(
+        pd.DataFrame({
+            "nome": [f"N{numero:02d}" for numero in range(linhas)],
+            "quantidade": [numero % 5 for numero in range(linhas)],
+        }),
+        "t",
+    )
+
+
+class PaginadaTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.app = AppTest.from_function(_pagina)
+        self.app.run()
+
+    def visiveis(self) -> list[str]:
+        return list(self.app.dataframe[0].value["nome"])
+
+    def test_first_page(self) -> None:
+        self.assertEqual(self.visiveis(), [f"N{numero:02d}" for numero in range(10)])
+        self.assertEqual(self.app.caption[0].value, "Linhas 1 a 10 de 23")
+        self.assertEqual(self.app.number_input(key="t:pagina").max, 3)
+
+    def test_last_page_is_partial(self) -> None:
+        self.app.number_input(key="t:pagina").set_value(3).run()
+        self.assertEqual(self.visiveis(), ["N20", "N21", "N22"])
+        self.assertEqual(self.app.caption[0].value, "Linhas 21 a 23 de 23")
+
+    def test_sort_is_stable_and_applies_before_slicing(self) -> None:
+        self.app.selectbox(key="t:coluna").set_value("quantidade")
+        self.app.selectbox(key="t:ordem").set_value(True).run()
+        # Quantidade 4 em N04, N09, N14, N19; depois 3, 2...
+        self.assertEqual(
+            self.visiveis(),
+            ["N04", "N09", "N14", "N19", "N03", "N08", "N13", "N18", "N02", "N07"],
+        )
+
+    def test_page_is_clamped_when_the_table_shrinks(self) -> None:
+        self.app.number_input(key="t:pagina").set_value(3).run()
+        self.app.session_state["linhas"] = 12
+        self.app.run()
+        self.assertEqual(self.app.number_input(key="t:pagina").value, 2)
+        self.assertEqual(self.visiveis(), ["N10", "N11"])
+
+    def test_empty_table(self) -> None:
+        self.app.session_state["linhas"] = 0
+        self.app.run()
+        self.assertEqual(self.app.number_input(key="t:pagina").max, 1)
+        self.assertEqual(self.app.caption[0].value, "Linhas 0 a 0 de 0")
+
+
+if __name__ == "__main__":
+    unittest.main()